@@ -3,53 +3,192 @@
 import io
 import json
 import os
-import sys
+import re
+import threading
+from types import MappingProxyType
 
 import pytest
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 整個模組都依賴 PySide6；缺少時在 collection 階段就乾淨地 skip，而不是逐一丟出 ImportError
+pytest.importorskip("PySide6.QtWidgets", reason="GUI test module requires PySide6")
+video_downloader = pytest.importorskip("video_downloader")
+from video_downloader import (  # noqa: E402
+    APP_VERSION,
+    COOKIE_UPDATE_INTERVAL,
+    DEFAULT_RETRY_COUNT,
+    HEIGHT_PRIORITY,
+    PATTERNS,
+    QUALITY_CAPS,
+    QUALITY_OPTIONS,
+    STATUS_COLORS,
+    VIDEO_EXTENSIONS,
+    BatchDownloadWorker,
+    CookieManager,
+    DownloadStats,
+    DownloadWorker,
+    MainWindow,
+    PersistWorker,
+    PlatformUtils,
+    _iter_marked_lines,
+    append_cancelled_playlist_results,
+    atomic_write_json,
+    build_remembered_playlist_rows,
+    build_task_completion_summary,
+    fetch_playlist_batch_metadata,
+    migrate_playlist_state_paths,
+    prune_metadata_cache,
+    remove_remembered_playlist,
+    render_download_report_html,
+    should_prompt_before_closing_task_tab,
+    summarize_playlist_check_results,
+    task_completion_dialog_level,
+)
+
+# ==================== 共用 URL fixture（模組層級常數，避免每個測試重建列表） ====================
+YOUTUBE_VIDEO_ID_URLS: tuple[str, ...] = (
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=abc123XYZ-_",
+)
+YOUTUBE_PLAYLIST_URLS: tuple[str, ...] = (
+    "https://www.youtube.com/playlist?list=PLxxxxxxxxxxxxxxxx",
+    "https://youtube.com/watch?v=xxx&list=PLtest123",
+)
+BILIBILI_VIDEO_URLS: tuple[str, ...] = (
+    "https://www.bilibili.com/video/BV1xx411c7mD",
+    "https://bilibili.com/video/BV1234567890",
+)
+YOUTUBE_PLATFORM_URLS: tuple[str, ...] = (
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/live/dQw4w9WgXcQ",
+    "https://www.youtube.com/playlist?list=PLtest123",
+    "https://YOUTUBE.COM/watch?v=test",
+)
+BILIBILI_PLATFORM_URLS: tuple[str, ...] = (
+    "https://www.bilibili.com/video/BV1xx411c7mD",
+    "https://bilibili.com/video/av12345",
+    "https://b23.tv/abcdef",
+    "https://www.BILIBILI.COM/video/BV1234567890",
+)
+# APP_VERSION 必須符合 vX.Y.Z 的 semver 格式
+_SEMVER_RE = re.compile(r"^v\d+\.\d+\.\d+$")
+
+# 標準化後的路徑不應殘留重複分隔符（開頭的 UNC 前綴除外）或 .. 片段
+_NORMALIZED_PATH_RE = re.compile(r"^(?!.*(?<!^)//)(?!.*\.\.).*$")
+
+# (url, 預期影片 ID)；Bilibili ID 會加上 bili_ 前綴
+EXTRACT_VIDEO_ID_CASES: tuple[tuple[str, str], ...] = (
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://youtube.com/watch?v=abc123XYZ-_", "abc123XYZ-_"),
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10s", "dQw4w9WgXcQ"),
+    ("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://youtu.be/abc123XYZ-_", "abc123XYZ-_"),
+    ("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://youtube.com/shorts/abc123XYZ-_", "abc123XYZ-_"),
+    ("https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://www.youtube.com/live/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://www.bilibili.com/video/BV1xx411c7mD", "bili_BV1xx411c7mD"),
+    ("https://www.bilibili.com/video/av12345678", "bili_av12345678"),
+)
+
+UNKNOWN_PLATFORM_URLS: tuple[str, ...] = (
+    "https://www.google.com",
+    "https://vimeo.com/12345",
+    "https://twitter.com/user/status/123",
+    "some random text",
+    "",
+)
+
+
+# normalize_path 對固定輸入的預期結果，於模組載入時計算一次
+_EXPECTED_TMP_DOWNLOADS_NORMALIZED = os.path.normcase(os.path.abspath(os.path.normpath("/tmp/downloads")))
+
+# BatchDownloadWorker 測試共用的基礎設定；各測試以 {**_BASE_SETTINGS, ...} 覆寫差異欄位
+_BASE_SETTINGS = MappingProxyType({"download_path": "/tmp/downloads", "quality": "best"})
+
+
+@pytest.fixture
+def make_batch_worker():
+    """工廠 fixture：task_id=1、urls=[] 為不變參數，呼叫端只覆寫有差異的 settings 欄位。"""
+
+    def _make(**settings_overrides):
+        return BatchDownloadWorker(task_id=1, urls=[], settings={**_BASE_SETTINGS, **settings_overrides})
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def cookie_file(tmp_path_factory):
+    """共用的 Netscape 格式 cookie 檔；整個測試 session 只寫一次磁碟。"""
+    path = tmp_path_factory.mktemp("cookies") / "cookies.txt"
+    path.write_text("# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tFALSE\t0\tSID\tvalue\n")
+    return path
+
+
+# Bilibili cookie 測試內容為固定值，同樣只寫一次磁碟
+_VALID_BILIBILI_COOKIE_CONTENT = (
+    "# Netscape HTTP Cookie File\n"
+    ".bilibili.com\tTRUE\t/\tFALSE\t0\tSESSDATA\ttest_sessdata\n"
+    ".bilibili.com\tTRUE\t/\tFALSE\t0\tbili_jct\ttest_bili_jct\n"
+    ".bilibili.com\tTRUE\t/\tFALSE\t0\tDedeUserID\ttest_user_id\n"
+)
+_PARTIAL_BILIBILI_COOKIE_CONTENT = (
+    "# Netscape HTTP Cookie File\n.bilibili.com\tTRUE\t/\tFALSE\t0\tSESSDATA\ttest_sessdata\n"
+)
+
+
+@pytest.fixture(scope="session")
+def valid_bilibili_cookie(tmp_path_factory):
+    """含全部關鍵欄位的 Bilibili cookie 檔。"""
+    path = tmp_path_factory.mktemp("cookies_bili") / "bilibili_cookies.txt"
+    path.write_text(_VALID_BILIBILI_COOKIE_CONTENT)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def partial_bilibili_cookie(tmp_path_factory):
+    """缺少 bili_jct / DedeUserID 的 Bilibili cookie 檔。"""
+    path = tmp_path_factory.mktemp("cookies_bili_partial") / "bilibili_cookies.txt"
+    path.write_text(_PARTIAL_BILIBILI_COOKIE_CONTENT)
+    return str(path)
+
+
+def _argv_map(cmd: list[str]) -> dict:
+    """將 argv 走訪一次，建成 {flag: value} 對照表，取代多次 O(n) 的 cmd.index 掃描。"""
+    parsed = {}
+    i, n = 0, len(cmd)
+    while i < n:
+        token = cmd[i]
+        if token.startswith("-") and i + 1 < n and not cmd[i + 1].startswith("-"):
+            parsed.setdefault(token, cmd[i + 1])
+            i += 2
+        else:
+            parsed.setdefault(token, True)
+            i += 1
+    return parsed
 
 
 class TestURLPatterns:
     """Test URL pattern matching."""
 
-    def test_youtube_video_id_pattern(self):
+    @pytest.mark.parametrize("url", YOUTUBE_VIDEO_ID_URLS)
+    def test_youtube_video_id_pattern(self, url):
         """Test YouTube video ID pattern."""
-        from video_downloader import PATTERNS
+        assert PATTERNS.YOUTUBE_VIDEO_ID.search(url), f"Should match: {url}"
 
-        valid_urls = [
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://www.youtube.com/watch?v=abc123XYZ-_",
-        ]
-
-        for url in valid_urls:
-            assert PATTERNS.YOUTUBE_VIDEO_ID.search(url), f"Should match: {url}"
-
-    def test_youtube_playlist_pattern(self):
+    @pytest.mark.parametrize("url", YOUTUBE_PLAYLIST_URLS)
+    def test_youtube_playlist_pattern(self, url):
         """Test YouTube playlist URL pattern."""
-        from video_downloader import PATTERNS
-
-        valid_urls = [
-            "https://www.youtube.com/playlist?list=PLxxxxxxxxxxxxxxxx",
-            "https://youtube.com/watch?v=xxx&list=PLtest123",
-        ]
-
-        for url in valid_urls:
-            assert PATTERNS.YOUTUBE_PLAYLIST.search(url), f"Should match: {url}"
+        assert PATTERNS.YOUTUBE_PLAYLIST.search(url), f"Should match: {url}"
 
-    def test_bilibili_video_pattern(self):
+    @pytest.mark.parametrize("url", BILIBILI_VIDEO_URLS)
+    def test_bilibili_video_pattern(self, url):
         """Test Bilibili video URL pattern."""
-        from video_downloader import PATTERNS
-
-        valid_urls = [
-            "https://www.bilibili.com/video/BV1xx411c7mD",
-            "https://bilibili.com/video/BV1234567890",
-        ]
-
-        for url in valid_urls:
-            assert PATTERNS.BILIBILI_VIDEO.search(url), f"Should match: {url}"
+        assert PATTERNS.BILIBILI_VIDEO.search(url), f"Should match: {url}"
 
 
 class TestVersionInfo:
@@ -57,39 +196,26 @@ class TestVersionInfo:
 
     def test_app_version_exists(self):
         """Test APP_VERSION is defined."""
-        from video_downloader import APP_VERSION
-
         assert APP_VERSION is not None
         assert APP_VERSION.startswith("v")
 
     def test_app_version_format(self):
         """Test APP_VERSION follows semver format."""
-        import re
-
-        from video_downloader import APP_VERSION
-
-        # Should match v0.0.0 format
-        pattern = r"^v\d+\.\d+\.\d+$"
-        assert re.match(pattern, APP_VERSION), f"Version {APP_VERSION} should match semver format"
+        assert _SEMVER_RE.match(APP_VERSION), f"Version {APP_VERSION} should match semver format"
 
 
 class TestConstants:
     """Test constant definitions."""
 
     def test_constants_exists(self):
-        """Test CONSTANTS is defined."""
-        from video_downloader import CONSTANTS
-
-        assert CONSTANTS is not None
-        assert hasattr(CONSTANTS, "VIDEO_EXTENSIONS")
-        assert hasattr(CONSTANTS, "QUALITY_OPTIONS")
+        """Test module-level constants are defined."""
+        assert VIDEO_EXTENSIONS
+        assert QUALITY_OPTIONS
 
     def test_quality_options(self):
         """Test quality options are defined."""
-        from video_downloader import CONSTANTS
-
-        assert "best" in CONSTANTS.QUALITY_OPTIONS
-        assert "1080p" in CONSTANTS.QUALITY_OPTIONS
+        assert "best" in QUALITY_OPTIONS
+        assert "1080p" in QUALITY_OPTIONS
 
 
 class TestImports:
@@ -97,12 +223,9 @@ class TestImports:
 
     def test_pyside6_available(self):
         """Test PySide6 is available."""
-        try:
-            from PySide6.QtWidgets import QApplication  # noqa: F401
+        from PySide6.QtWidgets import QApplication
 
-            assert True
-        except ImportError:
-            pytest.skip("PySide6 not installed")
+        assert QApplication is not None
 
     def test_main_module_imports(self):
         """Test main module can be imported."""
@@ -119,54 +242,23 @@ class TestImports:
 class TestPlatformUtils:
     """測試平台識別與工具函式"""
 
-    def test_detect_platform_youtube(self):
+    @pytest.mark.parametrize("url", YOUTUBE_PLATFORM_URLS)
+    def test_detect_platform_youtube(self, url):
         """測試各種 YouTube URL 格式的平台識別"""
-        from video_downloader import PlatformUtils
-
-        youtube_urls = [
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://youtu.be/dQw4w9WgXcQ",
-            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
-            "https://www.youtube.com/embed/dQw4w9WgXcQ",
-            "https://www.youtube.com/live/dQw4w9WgXcQ",
-            "https://www.youtube.com/playlist?list=PLtest123",
-            "https://YOUTUBE.COM/watch?v=test",
-        ]
-        for url in youtube_urls:
-            assert PlatformUtils.detect_platform(url) == "youtube", f"應識別為 youtube: {url}"
+        assert PlatformUtils.detect_platform(url) == "youtube", f"應識別為 youtube: {url}"
 
-    def test_detect_platform_bilibili(self):
+    @pytest.mark.parametrize("url", BILIBILI_PLATFORM_URLS)
+    def test_detect_platform_bilibili(self, url):
         """測試各種 Bilibili URL 格式的平台識別"""
-        from video_downloader import PlatformUtils
+        assert PlatformUtils.detect_platform(url) == "bilibili", f"應識別為 bilibili: {url}"
 
-        bilibili_urls = [
-            "https://www.bilibili.com/video/BV1xx411c7mD",
-            "https://bilibili.com/video/av12345",
-            "https://b23.tv/abcdef",
-            "https://www.BILIBILI.COM/video/BV1234567890",
-        ]
-        for url in bilibili_urls:
-            assert PlatformUtils.detect_platform(url) == "bilibili", f"應識別為 bilibili: {url}"
-
-    def test_detect_platform_unknown(self):
+    @pytest.mark.parametrize("url", UNKNOWN_PLATFORM_URLS)
+    def test_detect_platform_unknown(self, url):
         """測試未知 URL 的平台識別"""
-        from video_downloader import PlatformUtils
-
-        unknown_urls = [
-            "https://www.google.com",
-            "https://vimeo.com/12345",
-            "https://twitter.com/user/status/123",
-            "some random text",
-            "",
-        ]
-        for url in unknown_urls:
-            assert PlatformUtils.detect_platform(url) == "unknown", f"應識別為 unknown: {url}"
+        assert PlatformUtils.detect_platform(url) == "unknown", f"應識別為 unknown: {url}"
 
     def test_resolve_platform_honors_manual_selection(self):
         """手動選擇平台時，不應再被 URL 自動偵測覆蓋。"""
-        from video_downloader import PlatformUtils
-
         youtube_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
         assert PlatformUtils.resolve_platform(youtube_url, "auto") == "youtube"
@@ -174,57 +266,13 @@ class TestPlatformUtils:
         assert PlatformUtils.resolve_platform(youtube_url, "youtube") == "youtube"
         assert PlatformUtils.resolve_platform(youtube_url, "") == "youtube"
 
-    def test_extract_video_id_youtube_watch(self):
-        """測試 youtube.com/watch?v=xxx 格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        assert PlatformUtils.extract_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-        assert PlatformUtils.extract_video_id("https://youtube.com/watch?v=abc123XYZ-_") == "abc123XYZ-_"
-        # 帶有額外參數
-        assert PlatformUtils.extract_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10s") == "dQw4w9WgXcQ"
-
-    def test_extract_video_id_youtube_short(self):
-        """測試 youtu.be/xxx 短網址格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        assert PlatformUtils.extract_video_id("https://youtu.be/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-        assert PlatformUtils.extract_video_id("https://youtu.be/abc123XYZ-_") == "abc123XYZ-_"
-
-    def test_extract_video_id_youtube_shorts(self):
-        """測試 youtube.com/shorts/xxx 格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        assert PlatformUtils.extract_video_id("https://www.youtube.com/shorts/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-        assert PlatformUtils.extract_video_id("https://youtube.com/shorts/abc123XYZ-_") == "abc123XYZ-_"
-
-    def test_extract_video_id_youtube_embed(self):
-        """測試 youtube.com/embed/xxx 格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        assert PlatformUtils.extract_video_id("https://www.youtube.com/embed/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    def test_extract_video_id_youtube_live(self):
-        """測試 youtube.com/live/xxx 格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        assert PlatformUtils.extract_video_id("https://www.youtube.com/live/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    def test_extract_video_id_bilibili(self):
-        """測試 bilibili.com/video/BVxxx 格式的影片 ID 提取"""
-        from video_downloader import PlatformUtils
-
-        result = PlatformUtils.extract_video_id("https://www.bilibili.com/video/BV1xx411c7mD")
-        assert result.startswith("bili_")
-        assert "BV1xx411c7mD" in result
-
-        result_av = PlatformUtils.extract_video_id("https://www.bilibili.com/video/av12345678")
-        assert result_av.startswith("bili_")
-        assert "av12345678" in result_av
+    @pytest.mark.parametrize(("url", "expected"), EXTRACT_VIDEO_ID_CASES)
+    def test_extract_video_id(self, url, expected):
+        """測試各種 URL 格式的影片 ID 提取（YouTube watch/short/shorts/embed/live 與 Bilibili）"""
+        assert PlatformUtils.extract_video_id(url) == expected
 
     def test_extract_playlist_id(self):
         """測試播放清單 ID 提取"""
-        from video_downloader import PlatformUtils
-
         assert (
             PlatformUtils.extract_playlist_id("https://www.youtube.com/playlist?list=PLxxxxxxxxxxxxxxxx")
             == "PLxxxxxxxxxxxxxxxx"
@@ -241,8 +289,6 @@ class TestDownloadStats:
 
     def test_default_values(self):
         """測試預設值是否正確"""
-        from video_downloader import DownloadStats
-
         stats = DownloadStats()
         assert stats.total_downloads == 0
         assert stats.successful_downloads == 0
@@ -253,8 +299,6 @@ class TestDownloadStats:
 
     def test_to_dict(self):
         """測試序列化為字典"""
-        from video_downloader import DownloadStats
-
         stats = DownloadStats(
             total_downloads=10,
             successful_downloads=8,
@@ -273,8 +317,6 @@ class TestDownloadStats:
 
     def test_from_dict(self):
         """測試從字典反序列化"""
-        from video_downloader import DownloadStats
-
         data = {
             "total_downloads": 5,
             "successful_downloads": 4,
@@ -293,8 +335,6 @@ class TestDownloadStats:
 
     def test_from_dict_with_missing_keys(self):
         """測試部分資料反序列化時使用預設值"""
-        from video_downloader import DownloadStats
-
         # 空字典
         stats = DownloadStats.from_dict({})
         assert stats.total_downloads == 0
@@ -308,43 +348,29 @@ class TestDownloadStats:
         assert stats_partial.successful_downloads == 0
         assert stats_partial.skipped_downloads == 0
 
-    def test_format_bytes(self):
-        """測試各種大小格式化（B, KB, MB, GB）"""
-        from video_downloader import DownloadStats
-
-        stats = DownloadStats()
-
-        # Bytes
-        assert "B" in stats.format_bytes(500)
-        assert "500.00 B" == stats.format_bytes(500)
-
-        # KB
-        result_kb = stats.format_bytes(1024)
-        assert "KB" in result_kb
-        assert "1.00 KB" == result_kb
-
-        # MB
-        result_mb = stats.format_bytes(1024 * 1024)
-        assert "MB" in result_mb
-        assert "1.00 MB" == result_mb
-
-        # GB
-        result_gb = stats.format_bytes(1024 * 1024 * 1024)
-        assert "GB" in result_gb
-        assert "1.00 GB" == result_gb
-
-        # TB
-        result_tb = stats.format_bytes(1024 * 1024 * 1024 * 1024)
-        assert "TB" in result_tb
-        assert "1.00 TB" == result_tb
-
-        # 零
-        assert "0.00 B" == stats.format_bytes(0)
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def stats_inst():
+        """共用的 DownloadStats 實例；format_bytes 不依賴實例狀態。"""
+        return DownloadStats()
+
+    @pytest.mark.parametrize(
+        ("n_bytes", "expected"),
+        [
+            (0, "0.00 B"),
+            (500, "500.00 B"),
+            (1024, "1.00 KB"),
+            (1024**2, "1.00 MB"),
+            (1024**3, "1.00 GB"),
+            (1024**4, "1.00 TB"),
+        ],
+    )
+    def test_format_bytes(self, stats_inst, n_bytes, expected):
+        """測試各種大小格式化（B, KB, MB, GB, TB）"""
+        assert stats_inst.format_bytes(n_bytes) == expected
 
     def test_get_summary(self):
         """測試統計摘要輸出"""
-        from video_downloader import DownloadStats
-
         stats = DownloadStats(
             total_downloads=10,
             successful_downloads=8,
@@ -363,8 +389,6 @@ class TestDownloadStats:
 
     def test_get_summary_zero_downloads(self):
         """測試零下載時的摘要輸出（避免除以零）"""
-        from video_downloader import DownloadStats
-
         stats = DownloadStats()
         summary = stats.get_summary()
         assert "總下載數: 0" in summary
@@ -374,161 +398,85 @@ class TestDownloadStats:
 class TestCompiledPatterns:
     """測試預編譯正規表達式模式"""
 
-    def test_progress_percent_pattern(self):
-        """測試進度百分比解析"""
-        from video_downloader import PATTERNS
-
-        # 典型 yt-dlp 輸出行
-        line = "[download]  45.2% of 100.00MiB at 5.00MiB/s ETA 00:11"
-        match = PATTERNS.PROGRESS_PERCENT.search(line)
-        assert match is not None
-        assert match.group(1) == "45.2"
-
-        # 100%
-        line_100 = "[download] 100.0% of 100.00MiB"
-        match_100 = PATTERNS.PROGRESS_PERCENT.search(line_100)
-        assert match_100 is not None
-        assert match_100.group(1) == "100.0"
-
-        # 無百分比的行
-        line_no = "[info] Downloading video #1"
-        assert PATTERNS.PROGRESS_PERCENT.search(line_no) is None
-
-    def test_progress_speed_pattern(self):
-        """測試速度解析"""
-        from video_downloader import PATTERNS
-
-        line = "[download]  45.2% of 100.00MiB at 5.00MiB/s ETA 00:11"
-        match = PATTERNS.PROGRESS_SPEED.search(line)
-        assert match is not None
-        assert "5.00MiB/s" in match.group(1)
-
-        # KiB/s 速度
-        line_kb = "[download]  10.0% of 50.00MiB at 512.00KiB/s ETA 01:30"
-        match_kb = PATTERNS.PROGRESS_SPEED.search(line_kb)
-        assert match_kb is not None
-
-    def test_progress_eta_pattern(self):
-        """測試 ETA 解析"""
-        from video_downloader import PATTERNS
-
-        line = "[download]  45.2% of 100.00MiB at 5.00MiB/s ETA 00:11"
-        match = PATTERNS.PROGRESS_ETA.search(line)
-        assert match is not None
-        assert match.group(1) == "00:11"
-
-        # 較長的 ETA
-        line_long = "[download]  5.0% of 1.00GiB at 1.00MiB/s ETA 17:05"
-        match_long = PATTERNS.PROGRESS_ETA.search(line_long)
-        assert match_long is not None
-        assert match_long.group(1) == "17:05"
-
-    def test_file_size_pattern(self):
-        """測試檔案大小解析"""
-        from video_downloader import PATTERNS
-
-        # MiB
-        match_mb = PATTERNS.FILE_SIZE.search("100.50MiB")
-        assert match_mb is not None
-        assert match_mb.group(1) == "100.50"
-        assert match_mb.group(2).lower() == "m"
-
-        # GiB
-        match_gb = PATTERNS.FILE_SIZE.search("1.50GiB")
-        assert match_gb is not None
-        assert match_gb.group(1) == "1.50"
-        assert match_gb.group(2).lower() == "g"
-
-        # KiB
-        match_kb = PATTERNS.FILE_SIZE.search("512.00KiB")
-        assert match_kb is not None
-        assert match_kb.group(1) == "512.00"
-        assert match_kb.group(2).lower() == "k"
-
-        # 大寫 MB
-        match_upper = PATTERNS.FILE_SIZE.search("100MB")
-        assert match_upper is not None
-
-    def test_bracket_id_pattern(self):
-        """測試方括號 ID 解析"""
-        from video_downloader import PATTERNS
-
-        # 典型的影片檔名格式
-        filename = "Some Video Title [dQw4w9WgXcQ].mp4"
-        match = PATTERNS.BRACKET_ID.search(filename)
-        assert match is not None
-        assert match.group(1) == "dQw4w9WgXcQ"
-
-        # 較長的 ID
-        filename_long = "Video [abcdefghijklmnop].mp4"
-        match_long = PATTERNS.BRACKET_ID.search(filename_long)
-        assert match_long is not None
-        assert match_long.group(1) == "abcdefghijklmnop"
-
-        # 太短的 ID 不應匹配
-        filename_short = "Video [abc].mp4"
-        match_short = PATTERNS.BRACKET_ID.search(filename_short)
-        assert match_short is None
-
-    def test_download_speed_pattern(self):
-        """測試下載速度正規表達式"""
-        from video_downloader import PATTERNS
-
-        line = "5.00 MiB/s"
-        match = PATTERNS.DOWNLOAD_SPEED.search(line)
-        assert match is not None
-        assert match.group(1) == "5.00"
-
-    def test_bilibili_bv_pattern(self):
-        """測試 Bilibili BV 號正規表達式"""
-        from video_downloader import PATTERNS
-
-        url = "https://www.bilibili.com/video/BV1xx411c7mD"
-        match = PATTERNS.BILIBILI_BV.search(url)
-        assert match is not None
-        assert match.group(1) == "BV1xx411c7mD"
-
-    def test_bilibili_av_pattern(self):
-        """測試 Bilibili AV 號正規表達式"""
-        from video_downloader import PATTERNS
-
-        url = "https://www.bilibili.com/video/av12345678"
-        match = PATTERNS.BILIBILI_AV.search(url)
-        assert match is not None
-        assert match.group(1) == "av12345678"
+    # (pattern 名稱, 輸入文字, 預期結果)；None 表示不應匹配，tuple 表示 (group1, group2.lower())
+    PATTERN_CASES: tuple[tuple[str, str, object], ...] = (
+        # 檔案大小（大小寫不敏感）
+        ("FILE_SIZE", "100.50MiB", ("100.50", "m")),
+        ("FILE_SIZE", "1.50GiB", ("1.50", "g")),
+        ("FILE_SIZE", "512.00KiB", ("512.00", "k")),
+        ("FILE_SIZE", "100MB", ("100", "m")),
+        # 方括號 ID（至少 8 字元）
+        ("BRACKET_ID", "Some Video Title [dQw4w9WgXcQ].mp4", "dQw4w9WgXcQ"),
+        ("BRACKET_ID", "Video [abcdefghijklmnop].mp4", "abcdefghijklmnop"),
+        ("BRACKET_ID", "Video [abc].mp4", None),
+        # Bilibili BV / AV 號
+        ("BILIBILI_BV", "https://www.bilibili.com/video/BV1xx411c7mD", "BV1xx411c7mD"),
+        ("BILIBILI_AV", "https://www.bilibili.com/video/av12345678", "av12345678"),
+    )
+
+    @pytest.mark.parametrize(("pattern_name", "text", "expected"), PATTERN_CASES)
+    def test_pattern_search(self, pattern_name, text, expected):
+        """逐一驗證預編譯 pattern 的匹配結果"""
+        match = getattr(PATTERNS, pattern_name).search(text)
+        if expected is None:
+            assert match is None
+        elif isinstance(expected, tuple):
+            assert (match.group(1), match.group(2).lower()) == expected
+        else:
+            assert match.group(1) == expected
+
+    # (輸入文字, 預期 (pct, size, speed, eta)；None 表示整行不應匹配)
+    PROGRESS_ALL_CASES: tuple[tuple[str, object], ...] = (
+        (
+            "[download]  45.2% of 100.00MiB at 5.00MiB/s ETA 00:11",
+            ("45.2", "100.00MiB", "5.00MiB/s", "00:11"),
+        ),
+        (
+            "[download]  10.0% of 50.00MiB at 512.00KiB/s ETA 01:30",
+            ("10.0", "50.00MiB", "512.00KiB/s", "01:30"),
+        ),
+        ("[download] 100.0% of 100.00MiB", ("100.0", "100.00MiB", None, None)),
+        ("[info] Downloading video #1", None),
+    )
+
+    @pytest.mark.parametrize(("text", "expected"), PROGRESS_ALL_CASES)
+    def test_progress_all(self, text, expected):
+        """驗證合併後的進度 pattern 一次取得所有欄位"""
+        match = PATTERNS.PROGRESS_ALL.search(text)
+        if expected is None:
+            assert match is None
+        else:
+            actual = tuple(match.group(name) for name in ("pct", "size", "speed", "eta"))
+            assert actual == expected
 
 
 class TestDownloadWorkerBuildCommand:
     """測試 DownloadWorker 的命令建構"""
 
-    def test_basic_command(self):
-        """測試基本命令建構"""
-        from video_downloader import DownloadWorker
-
-        worker = DownloadWorker(
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def base_worker():
+        """共用的預設 worker；只讀取 _build_command 輸出的測試不需要各自建構。"""
+        return DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
         )
-        cmd = worker._build_command("youtube")
+
+    def test_basic_command(self, base_worker):
+        """測試基本命令建構"""
+        cmd = base_worker._build_command("youtube")
+        flags = set(cmd)
 
         assert "yt-dlp" in cmd[0]
-        assert "-o" in cmd
-        assert "--no-playlist" in cmd
-        assert "--progress" in cmd
-        assert "--newline" in cmd
+        assert {"-o", "--no-playlist", "--progress", "--newline"} <= flags
         assert cmd[-1] == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         # 預設格式
-        assert "-f" in cmd
-        f_index = cmd.index("-f")
-        assert "best" in cmd[f_index + 1]
+        assert "-f" in flags
+        args = _argv_map(cmd)
+        assert "best" in args["-f"]
 
-    def test_command_with_cookies(self, tmp_path):
+    def test_command_with_cookies(self, cookie_file):
         """測試帶 cookie 的命令"""
-        from video_downloader import DownloadWorker
-
-        cookie_file = tmp_path / "cookies.txt"
-        cookie_file.write_text("# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tFALSE\t0\tSID\tvalue\n")
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -537,13 +485,11 @@ class TestDownloadWorkerBuildCommand:
         cmd = worker._build_command("youtube")
 
         assert "--cookies" in cmd
-        cookie_index = cmd.index("--cookies")
-        assert cmd[cookie_index + 1] == str(cookie_file)
+        args = _argv_map(cmd)
+        assert args["--cookies"] == str(cookie_file)
 
     def test_command_without_existing_cookie_file(self):
         """測試 cookie 檔案不存在時不加入 --cookies 參數"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -555,8 +501,6 @@ class TestDownloadWorkerBuildCommand:
 
     def test_command_with_rate_limit(self):
         """測試帶速度限制的命令"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -565,13 +509,11 @@ class TestDownloadWorkerBuildCommand:
         cmd = worker._build_command("youtube")
 
         assert "--limit-rate" in cmd
-        rate_index = cmd.index("--limit-rate")
-        assert cmd[rate_index + 1] == "5M"
+        args = _argv_map(cmd)
+        assert args["--limit-rate"] == "5M"
 
     def test_command_with_subtitles(self):
         """測試帶字幕的命令"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -579,19 +521,14 @@ class TestDownloadWorkerBuildCommand:
             sub_langs="zh-TW,en",
         )
         cmd = worker._build_command("youtube")
+        flags = set(cmd)
 
-        assert "--write-subs" in cmd
-        assert "--write-auto-subs" in cmd
-        assert "--sub-langs" in cmd
-        lang_index = cmd.index("--sub-langs")
-        assert cmd[lang_index + 1] == "zh-TW,en"
-        assert "--embed-subs" in cmd
-        assert "--convert-subs" in cmd
+        assert {"--write-subs", "--write-auto-subs", "--sub-langs", "--embed-subs", "--convert-subs"} <= flags
+        args = _argv_map(cmd)
+        assert args["--sub-langs"] == "zh-TW,en"
 
     def test_command_bilibili_platform(self):
         """測試 Bilibili 平台特定參數"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.bilibili.com/video/BV1xx411c7mD",
             output_dir="/tmp/downloads",
@@ -599,14 +536,12 @@ class TestDownloadWorkerBuildCommand:
         cmd = worker._build_command("bilibili")
 
         assert "--referer" in cmd
-        referer_index = cmd.index("--referer")
-        assert cmd[referer_index + 1] == "https://www.bilibili.com"
+        args = _argv_map(cmd)
+        assert args["--referer"] == "https://www.bilibili.com"
         assert "--add-header" in cmd
 
     def test_command_with_format_id(self):
         """測試指定格式 ID 的命令"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -614,28 +549,20 @@ class TestDownloadWorkerBuildCommand:
         )
         cmd = worker._build_command("youtube")
 
-        f_index = cmd.index("-f")
-        assert cmd[f_index + 1] == "137+140"
+        args = _argv_map(cmd)
+        assert args["-f"] == "137+140"
 
-    def test_worker_default_attributes(self):
+    def test_worker_default_attributes(self, base_worker):
         """測試 DownloadWorker 預設屬性"""
-        from video_downloader import CONSTANTS, DownloadWorker
-
-        worker = DownloadWorker(
-            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            output_dir="/tmp/downloads",
-        )
-        assert worker.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        assert worker.output_dir == "/tmp/downloads"
-        assert worker.max_retries == CONSTANTS.DEFAULT_RETRY_COUNT
-        assert worker.rate_limit is None
-        assert worker.include_subs is False
-        assert worker._is_cancelled is False
+        assert base_worker.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        assert base_worker.output_dir == "/tmp/downloads"
+        assert base_worker.max_retries == DEFAULT_RETRY_COUNT
+        assert base_worker.rate_limit is None
+        assert base_worker.include_subs is False
+        assert base_worker._is_cancelled is False
 
     def test_worker_custom_video_id(self):
         """測試自訂影片 ID"""
-        from video_downloader import DownloadWorker
-
         worker = DownloadWorker(
             url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             output_dir="/tmp/downloads",
@@ -643,15 +570,9 @@ class TestDownloadWorkerBuildCommand:
         )
         assert worker.video_id == "custom_id"
 
-    def test_worker_auto_video_id(self):
+    def test_worker_auto_video_id(self, base_worker):
         """測試自動提取影片 ID"""
-        from video_downloader import DownloadWorker
-
-        worker = DownloadWorker(
-            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            output_dir="/tmp/downloads",
-        )
-        assert worker.video_id == "dQw4w9WgXcQ"
+        assert base_worker.video_id == "dQw4w9WgXcQ"
 
 
 class TestBatchDownloadWorkerBuildCommand:
@@ -659,130 +580,73 @@ class TestBatchDownloadWorkerBuildCommand:
 
     def test_basic_ytdlp_command(self):
         """測試基本命令"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp/downloads", "quality": "best"}
+        settings = dict(_BASE_SETTINGS)
         worker = BatchDownloadWorker(task_id=1, urls=["https://www.youtube.com/watch?v=test"], settings=settings)
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
+        flags = set(cmd)
+
         assert "yt-dlp" in cmd[0]
         assert cmd[-1] == "https://www.youtube.com/watch?v=test"
-        assert "--no-warnings" in cmd
-        assert "--ignore-errors" in cmd
-        assert "--retries" in cmd
-
-    def test_command_with_quality_best(self):
-        """測試 best 畫質設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp/downloads", "quality": "best"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
-        cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
-
-        f_index = cmd.index("-f")
-        assert cmd[f_index + 1] == "bestvideo+bestaudio/best"
-
-    def test_command_with_quality_1080p(self):
-        """測試 1080p 畫質設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp/downloads", "quality": "1080p"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        assert {"--no-warnings", "--ignore-errors", "--retries"} <= flags
+
+    @pytest.mark.parametrize(
+        ("quality", "expected_format"),
+        [
+            ("best", "bestvideo+bestaudio/best"),
+            ("1080p", "bestvideo[height<=1080]+bestaudio/best[height<=1080]"),
+            ("worst", "worstvideo+worstaudio/worst"),
+            ("137+140", "137+140"),
+        ],
+    )
+    def test_command_quality(self, make_batch_worker, quality, expected_format):
+        """測試各種畫質設定對應的 -f 格式字串"""
+        worker = make_batch_worker(quality=quality)
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
-        f_index = cmd.index("-f")
-        format_str = cmd[f_index + 1]
-        assert "1080" in format_str
-        assert "bestvideo" in format_str
+        assert _argv_map(cmd)["-f"] == expected_format
 
-    def test_command_with_quality_worst(self):
-        """測試 worst 畫質設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp/downloads", "quality": "worst"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
-        cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
-
-        f_index = cmd.index("-f")
-        assert "worst" in cmd[f_index + 1]
-
-    def test_command_with_subtitles(self):
+    def test_command_with_subtitles(self, make_batch_worker):
         """測試字幕設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-            "download_subtitle": True,
-            "auto_subtitle": True,
-            "subtitle_lang": "zh-TW,en",
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker(download_subtitle=True, auto_subtitle=True, subtitle_lang="zh-TW,en")
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
+        flags = set(cmd)
 
-        assert "--write-subs" in cmd
-        assert "--write-auto-subs" in cmd
-        assert "--sub-langs" in cmd
-        lang_index = cmd.index("--sub-langs")
-        assert cmd[lang_index + 1] == "zh-TW,en"
-        assert "--embed-subs" in cmd
+        assert {"--write-subs", "--write-auto-subs", "--sub-langs", "--embed-subs"} <= flags
+        args = _argv_map(cmd)
+        assert args["--sub-langs"] == "zh-TW,en"
 
-    def test_command_with_subtitles_only(self):
+    def test_command_with_subtitles_only(self, make_batch_worker):
         """測試僅下載字幕模式"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-            "download_subtitle": True,
-            "subtitle_only": True,
-            "subtitle_lang": "zh-TW",
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker(download_subtitle=True, subtitle_only=True, subtitle_lang="zh-TW")
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
+        flags = set(cmd)
 
-        assert "--write-subs" in cmd
-        assert "--skip-download" in cmd
+        assert {"--write-subs", "--skip-download"} <= flags
         # subtitle_only 模式下不應嵌入字幕
-        assert "--embed-subs" not in cmd
+        assert "--embed-subs" not in flags
 
-    def test_command_bilibili_headers(self):
+    def test_command_bilibili_headers(self, make_batch_worker):
         """測試 Bilibili headers 設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp/downloads", "quality": "best"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker()
         cmd = worker._build_ytdlp_command("https://www.bilibili.com/video/BV1xx411c7mD", "bilibili")
 
         assert "--referer" in cmd
-        referer_index = cmd.index("--referer")
-        assert cmd[referer_index + 1] == "https://www.bilibili.com"
+        args = _argv_map(cmd)
+        assert args["--referer"] == "https://www.bilibili.com"
         assert "--user-agent" in cmd
 
-    def test_command_with_cookies(self, tmp_path):
+    def test_command_with_cookies(self, make_batch_worker, cookie_file):
         """測試帶 cookie 的命令"""
-        from video_downloader import BatchDownloadWorker
-
-        cookie_file = tmp_path / "youtube_cookies.txt"
-        cookie_file.write_text("# Netscape HTTP Cookie File\n")
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-            "use_cookies": True,
-            "youtube_cookie_file": str(cookie_file),
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker(use_cookies=True, youtube_cookie_file=str(cookie_file))
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
         assert "--cookies" in cmd
-        cookie_index = cmd.index("--cookies")
-        assert cmd[cookie_index + 1] == str(cookie_file)
+        args = _argv_map(cmd)
+        assert args["--cookies"] == str(cookie_file)
 
     def test_resolve_platform_uses_worker_platform_setting(self):
         """Batch worker 應尊重 UI 傳入的平台設定。"""
-        from video_downloader import BatchDownloadWorker
-
         worker = BatchDownloadWorker(
             task_id=1,
             urls=["https://www.youtube.com/watch?v=dQw4w9WgXcQ"],
@@ -795,13 +659,11 @@ class TestBatchDownloadWorkerBuildCommand:
         self, tmp_path, monkeypatch
     ):
         """Firefox cookie 讀取失敗時，實際下載應自動重試無 cookie 指令。"""
-        from video_downloader import BatchDownloadWorker
-
         calls = []
 
         class FakeProcess:
             def __init__(self, return_code):
-                self.stdout = io.StringIO("")
+                self.stdout = io.BytesIO(b"")
                 self.returncode = return_code
 
             def wait(self, timeout=None):
@@ -838,77 +700,40 @@ class TestBatchDownloadWorkerBuildCommand:
         assert "--cookies-from-browser" not in calls[1]
         assert "--cookies" not in calls[1]
 
-    def test_command_with_output_template(self):
+    def test_command_with_output_template(self, make_batch_worker):
         """測試輸出模板設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker()
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
         assert "-o" in cmd
-        o_index = cmd.index("-o")
-        template = cmd[o_index + 1]
-        assert "/tmp/downloads" in template.replace("\\", "/")
+        args = _argv_map(cmd)
+        template = args["-o"]
+        # 直接檢查兩種分隔符寫法，避免為比較而配置一個正規化後的新字串
+        assert "/tmp/downloads" in template or "\\tmp\\downloads" in template
         assert "%(ext)s" in template
 
-    def test_command_with_custom_filename_template(self):
+    def test_command_with_custom_filename_template(self, make_batch_worker):
         """測試自訂檔名模板"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-            "use_custom_filename": True,
-            "custom_filename_template": "%(title)s",
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker(use_custom_filename=True, custom_filename_template="%(title)s")
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
-        o_index = cmd.index("-o")
-        template = cmd[o_index + 1]
+        args = _argv_map(cmd)
+        template = args["-o"]
         assert "%(title)s" in template
         # 應自動附加 %(ext)s
         assert "%(ext)s" in template
 
-    def test_command_with_quality_as_custom_format(self):
-        """測試自訂格式字串"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "137+140",
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
-        cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
-
-        f_index = cmd.index("-f")
-        assert cmd[f_index + 1] == "137+140"
-
-    def test_command_with_trim_filename(self):
+    def test_command_with_trim_filename(self, make_batch_worker):
         """測試檔名裁切設定"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {
-            "download_path": "/tmp/downloads",
-            "quality": "best",
-            "auto_trim_filename": True,
-            "trim_filename_length": 80,
-        }
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker(auto_trim_filename=True, trim_filename_length=80)
         cmd = worker._build_ytdlp_command("https://www.youtube.com/watch?v=test", "youtube")
 
         assert "--trim-filenames" in cmd
-        trim_index = cmd.index("--trim-filenames")
-        assert cmd[trim_index + 1] == "80"
+        args = _argv_map(cmd)
+        assert args["--trim-filenames"] == "80"
 
     def test_batch_worker_default_stats(self):
         """測試 BatchDownloadWorker 預設統計"""
-        from video_downloader import BatchDownloadWorker
-
         settings = {"download_path": "/tmp/downloads"}
         worker = BatchDownloadWorker(task_id=1, urls=["url1", "url2"], settings=settings)
 
@@ -924,32 +749,20 @@ class TestMainWindowHelpers:
 
     def test_normalize_path(self):
         """測試路徑標準化"""
-        from video_downloader import MainWindow
-
-        # 基本路徑標準化
-        result = MainWindow.normalize_path("/tmp/downloads")
-        assert result != ""
-        assert os.path.isabs(result)
-
-        # 路徑中有多餘的分隔符
-        result_extra = MainWindow.normalize_path("/tmp//downloads///test")
-        assert "//" not in result_extra.replace("\\\\", "")  # Windows 可能有 UNC path
+        # 基本路徑標準化（與模組載入時算好的預期值完全相等）
+        assert MainWindow.normalize_path("/tmp/downloads") == _EXPECTED_TMP_DOWNLOADS_NORMALIZED
 
-        # 路徑中有 .. 應被解析
-        result_dotdot = MainWindow.normalize_path("/tmp/downloads/../other")
-        assert ".." not in result_dotdot
+        # 多餘的分隔符與 .. 都應被解析掉；單一 regex 驗證，不再為比較配置替換後的字串
+        assert _NORMALIZED_PATH_RE.match(MainWindow.normalize_path("/tmp//downloads///test"))
+        assert _NORMALIZED_PATH_RE.match(MainWindow.normalize_path("/tmp/downloads/../other"))
 
     def test_normalize_path_empty(self):
         """測試空路徑標準化"""
-        from video_downloader import MainWindow
-
         assert MainWindow.normalize_path("") == ""
         assert MainWindow.normalize_path(None) == ""
 
     def test_normalize_path_consistency(self):
         """測試路徑標準化的一致性"""
-        from video_downloader import MainWindow
-
         # 相同路徑的不同寫法應得到相同結果
         path1 = MainWindow.normalize_path("/tmp/downloads")
         path2 = MainWindow.normalize_path("/tmp/downloads/")
@@ -957,10 +770,15 @@ class TestMainWindowHelpers:
         assert path1 == path2
         assert path1 == path3
 
+    def test_normalize_path_uses_cache(self):
+        """重複輸入應命中 lru_cache，不重算標準化結果"""
+        video_downloader._normalize_path_cached.cache_clear()
+        for _ in range(5):
+            MainWindow.normalize_path("/tmp/cache-probe")
+        assert video_downloader._normalize_path_cached.cache_info().hits >= 4
+
     def test_should_not_prompt_ui_path_change_during_batch_check(self):
         """批次檢查所有清單時，不應拿目前 UI 路徑去觸發每個清單的路徑變更提示。"""
-        from video_downloader import MainWindow
-
         old_path = MainWindow.normalize_path("/tmp/old")
         ui_path = MainWindow.normalize_path("/tmp/current")
 
@@ -973,8 +791,6 @@ class TestStateAndReportHelpers:
 
     def test_migrate_playlist_state_moves_only_requested_playlist_and_its_history(self):
         """同一路徑多個清單時，只遷移被指定的 playlist。"""
-        from video_downloader import migrate_playlist_state_paths
-
         old_path = "/downloads/old"
         new_path = "/downloads/new"
         playlist_states = {
@@ -1000,8 +816,6 @@ class TestStateAndReportHelpers:
 
     def test_migrate_playlist_state_can_move_history_without_playlist_state(self):
         """整個路徑搬移時，即使沒有 playlist state 也應遷移下載歷史。"""
-        from video_downloader import migrate_playlist_state_paths
-
         old_path = "/downloads/old"
         new_path = "/downloads/new"
         playlist_states = {}
@@ -1014,17 +828,56 @@ class TestStateAndReportHelpers:
 
     def test_atomic_write_json_writes_valid_json(self, tmp_path):
         """JSON 儲存應透過 atomic write 寫出完整檔案。"""
-        from video_downloader import atomic_write_json
-
         target = tmp_path / "state.json"
         atomic_write_json(target, {"name": "測試", "items": [1, 2, 3]})
 
         assert json.loads(target.read_text(encoding="utf-8")) == {"name": "測試", "items": [1, 2, 3]}
 
+    def test_persist_worker_coalesces_writes(self, tmp_path):
+        """背景持久化應合併同一路徑的連續寫入，commit 後留下最後一份快照。"""
+        worker = PersistWorker()
+        worker.FLUSH_INTERVAL = 0.05  # 縮短 flush 週期，測試不必等滿一秒
+        worker.start()
+        target = str(tmp_path / "history.json")
+        worker.submit(target, {"version": 1})
+        worker.submit(target, {"version": 2})
+        worker.commit()
+
+        assert json.loads((tmp_path / "history.json").read_text(encoding="utf-8")) == {"version": 2}
+
+    def test_iter_marked_lines_yields_lines_from_live_pipe_before_eof(self):
+        """行應在 pipe 關閉前就產出，而不是等累積滿 64KB 或 EOF 才整批湧出。
+
+        舊版用 stream.read(65536)，在真正的 pipe 上會阻塞到湊滿 64KB 或子行程
+        結束；io.BytesIO 不會阻塞所以看不出來，這裡改用真實 pipe 驗證。
+        """
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(read_fd, "rb")
+        first_line_seen = threading.Event()
+        seen_before_close = []
+
+        def writer():
+            with os.fdopen(write_fd, "wb") as w:
+                w.write(b"[download]  10.0% of 10MiB\n")
+                w.flush()
+                # 等讀端先收到第一行才關閉 pipe，證明不是 EOF 後才一次解出
+                seen_before_close.append(first_line_seen.wait(timeout=5))
+                w.write(b"[download] 100.0% of 10MiB\n")
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        lines = []
+        with stream:
+            for line in _iter_marked_lines(stream, (b"[download]",)):
+                lines.append(line)
+                first_line_seen.set()
+        writer_thread.join()
+
+        assert seen_before_close == [True]
+        assert lines == ["[download]  10.0% of 10MiB", "[download] 100.0% of 10MiB"]
+
     def test_render_download_report_html_escapes_user_controlled_fields(self):
         """HTML 報告應 escape 路徑、標題、網址，避免特殊字元破版或插入 HTML。"""
-        from video_downloader import render_download_report_html
-
         history = {
             r"C:\Downloads\<unsafe>": {
                 "abc123": {
@@ -1044,8 +897,6 @@ class TestStateAndReportHelpers:
 
     def test_summarize_playlist_check_results_counts_statuses_and_lists_titles(self):
         """批次檢查摘要應統計變動、失敗、無變動與取消項目。"""
-        from video_downloader import summarize_playlist_check_results
-
         summary = summarize_playlist_check_results(
             [
                 {"status": "proceed", "playlist_title": "A 清單"},
@@ -1069,8 +920,6 @@ class TestRememberedPlaylistManagementHelpers:
 
     def test_build_remembered_playlist_rows_sorts_and_formats_rows(self):
         """管理 UI 使用的清單資料應包含標題、路徑、影片數與顯示文字。"""
-        from video_downloader import build_remembered_playlist_rows
-
         rows = build_remembered_playlist_rows(
             {
                 "/downloads/b": {
@@ -1102,8 +951,6 @@ class TestRememberedPlaylistManagementHelpers:
 
     def test_remove_remembered_playlist_removes_empty_path_bucket(self):
         """移除已記住播放清單時，空路徑 bucket 應一併清掉。"""
-        from video_downloader import remove_remembered_playlist
-
         playlist_states = {
             "/downloads/a": {"pl-a": {"playlist_title": "A"}},
             "/downloads/b": {"pl-b": {"playlist_title": "B"}},
@@ -1119,9 +966,7 @@ class TestPlaylistBatchCheckHelpers:
     """測試批次檢查所有清單的進度與取消 helper。"""
 
     def test_fetch_playlist_batch_metadata_reports_progress_and_stops_after_cancel(self):
-        """取消旗標出現後，批次抓取應停止處理剩餘清單並回報 cancelled。"""
-        from video_downloader import fetch_playlist_batch_metadata
-
+        """取消旗標出現後，批次抓取應跳過剩餘清單並回報 cancelled（max_workers=1 讓時序可預期）。"""
         jobs = [
             {"playlist_id": "a", "playlist_url": "https://example.test/a", "playlist_title": "A"},
             {"playlist_id": "b", "playlist_url": "https://example.test/b", "playlist_title": "B"},
@@ -1139,6 +984,7 @@ class TestPlaylistBatchCheckHelpers:
             fetch_metadata,
             should_cancel=lambda: len(fetched_urls) >= 1,
             on_progress=lambda current, total, title: progress.append((current, total, title)),
+            max_workers=1,
         )
 
         assert cancelled is True
@@ -1146,10 +992,46 @@ class TestPlaylistBatchCheckHelpers:
         assert len(results) == 1
         assert progress == [(1, 3, "A")]
 
+    def test_fetch_playlist_batch_metadata_parallel_keeps_job_order(self):
+        """並行抓取時結果仍需依 jobs 順序排列，且每份清單都回報進度。"""
+        jobs = [
+            {"playlist_id": pid, "playlist_url": f"https://example.test/{pid}", "playlist_title": pid.upper()}
+            for pid in ("a", "b", "c", "d")
+        ]
+        progress = []
+
+        def fetch_metadata(url):
+            return {"id": url.rsplit("/", 1)[-1]}
+
+        results, cancelled = fetch_playlist_batch_metadata(
+            jobs,
+            fetch_metadata,
+            on_progress=lambda current, total, title: progress.append((current, total, title)),
+        )
+
+        assert cancelled is False
+        assert [job["playlist_id"] for job, _ in results] == ["a", "b", "c", "d"]
+        assert [metadata["id"] for _, metadata in results] == ["a", "b", "c", "d"]
+        assert sorted(current for current, _, _ in progress) == [1, 2, 3, 4]
+        assert all(total == 4 for _, total, _ in progress)
+
+    def test_prune_metadata_cache_drops_expired_and_malformed_entries(self):
+        """逾期與格式錯誤的快取項目應被移除，TTL 內的項目保留。"""
+        now = 10_000.0
+        cache = {
+            "https://example.test/fresh": [now - 100, {"id": "fresh"}],
+            "https://example.test/stale": [now - 7200, {"id": "stale"}],
+            "https://example.test/broken": "not-a-pair",
+            "https://example.test/no-metadata": [now - 100, None],
+        }
+
+        pruned = prune_metadata_cache(cache, now, ttl=3600)
+
+        assert list(pruned) == ["https://example.test/fresh"]
+        assert pruned["https://example.test/fresh"] == [now - 100, {"id": "fresh"}]
+
     def test_append_cancelled_playlist_results_marks_unprocessed_jobs(self):
         """批次取消時，尚未處理的清單應進入摘要的 cancel 統計。"""
-        from video_downloader import append_cancelled_playlist_results, summarize_playlist_check_results
-
         jobs = [
             {"download_path": "/downloads", "playlist_id": "a", "playlist_url": "https://example.test/a"},
             {"download_path": "/downloads", "playlist_id": "b", "playlist_url": "https://example.test/b"},
@@ -1170,23 +1052,17 @@ class TestDownloadTaskUxHelpers:
 
     def test_should_prompt_before_closing_task_tab_only_for_running_non_overview_tabs(self):
         """只有執行中的任務分頁關閉時需要提示；總覽或已完成任務不用提示。"""
-        from video_downloader import should_prompt_before_closing_task_tab
-
         assert should_prompt_before_closing_task_tab(tab_index=0, worker_is_running=True) is False
         assert should_prompt_before_closing_task_tab(tab_index=1, worker_is_running=False) is False
         assert should_prompt_before_closing_task_tab(tab_index=1, worker_is_running=True) is True
 
     def test_task_completion_dialog_level_only_warns_when_failures_exist(self):
         """純成功任務不應彈窗；有失敗時才用 warning 提醒。"""
-        from video_downloader import task_completion_dialog_level
-
         assert task_completion_dialog_level({"success": 3, "failed": 0, "skipped": 0}) is None
         assert task_completion_dialog_level({"success": 2, "failed": 1, "skipped": 0}) == "warning"
 
     def test_build_task_completion_summary_contains_counts(self):
         """任務完成摘要應穩定包含成功、失敗與跳過數量。"""
-        from video_downloader import build_task_completion_summary
-
         summary = build_task_completion_summary(7, {"success": 2, "failed": 1, "skipped": 3})
 
         assert "任務 7 已完成" in summary
@@ -1198,81 +1074,73 @@ class TestDownloadTaskUxHelpers:
 class TestStatusColors:
     """測試狀態顏色定義"""
 
-    def test_status_colors_defined(self):
-        """測試所有狀態顏色已定義"""
-        from video_downloader import STATUS_COLORS
+    EXPECTED_STATUS_COLORS: dict[str, str] = {
+        "SUCCESS": "#4CAF50",
+        "FAILED": "#F44336",
+        "SKIPPED": "#FFC107",
+        "PENDING": "#9E9E9E",
+        "RUNNING": "#2196F3",
+        "VALID": "#4CAF50",
+        "INVALID": "#F44336",
+        "UNKNOWN": "#FFC107",
+    }
 
-        assert STATUS_COLORS.SUCCESS == "#4CAF50"
-        assert STATUS_COLORS.FAILED == "#F44336"
-        assert STATUS_COLORS.SKIPPED == "#FFC107"
-        assert STATUS_COLORS.PENDING == "#9E9E9E"
-        assert STATUS_COLORS.RUNNING == "#2196F3"
-        assert STATUS_COLORS.VALID == "#4CAF50"
-        assert STATUS_COLORS.INVALID == "#F44336"
-        assert STATUS_COLORS.UNKNOWN == "#FFC107"
+    def test_status_colors(self):
+        """一次比對全部狀態顏色；assertion rewriting 會列出差異的 key"""
+        assert dict(STATUS_COLORS) == self.EXPECTED_STATUS_COLORS
 
 
 class TestAppConstants:
     """測試應用程式常數"""
 
-    def test_video_extensions(self):
-        """測試影片副檔名列表"""
-        from video_downloader import CONSTANTS
-
-        assert ".mp4" in CONSTANTS.VIDEO_EXTENSIONS
-        assert ".webm" in CONSTANTS.VIDEO_EXTENSIONS
-        assert ".mkv" in CONSTANTS.VIDEO_EXTENSIONS
-
-    def test_ignore_suffixes(self):
-        """測試忽略的暫存檔副檔名"""
-        from video_downloader import CONSTANTS
-
-        assert ".part" in CONSTANTS.IGNORE_SUFFIXES
-        assert ".ytdl" in CONSTANTS.IGNORE_SUFFIXES
-        assert ".temp" in CONSTANTS.IGNORE_SUFFIXES
-
-    def test_quality_caps(self):
+    # 常數名稱 -> 預期值
+    EXPECTED_SCALARS: dict[str, object] = {
+        "DEFAULT_TIMEOUT": 10800,
+        "DEFAULT_RETRY_COUNT": 3,
+        "DEFAULT_RATE_LIMIT": "0",
+        "RETRY_DELAY": 2,
+        "COOKIE_UPDATE_INTERVAL": 600,
+    }
+
+    # (容器常數名稱, 必須包含的成員)
+    MEMBERSHIP_CASES: tuple[tuple[str, str], ...] = (
+        ("VIDEO_EXTENSIONS", ".mp4"),
+        ("VIDEO_EXTENSIONS", ".webm"),
+        ("VIDEO_EXTENSIONS", ".mkv"),
+        ("IGNORE_SUFFIXES", ".part"),
+        ("IGNORE_SUFFIXES", ".ytdl"),
+        ("IGNORE_SUFFIXES", ".temp"),
+        ("YOUTUBE_KEY_COOKIES", "SAPISID"),
+        ("YOUTUBE_KEY_COOKIES", "HSID"),
+        ("BILIBILI_KEY_COOKIES", "SESSDATA"),
+        ("BILIBILI_KEY_COOKIES", "bili_jct"),
+        ("BILIBILI_KEY_COOKIES", "DedeUserID"),
+    )
+
+    def test_scalar_constants(self):
+        """一次比對全部純量常數值"""
+        actual = {key: getattr(video_downloader, key) for key in self.EXPECTED_SCALARS}
+        assert actual == self.EXPECTED_SCALARS
+
+    @pytest.mark.parametrize(("attr", "member"), MEMBERSHIP_CASES)
+    def test_container_constant_member(self, attr, member):
+        """逐一驗證容器常數的必要成員"""
+        assert member in getattr(video_downloader, attr)
+
+    @pytest.mark.parametrize(
+        ("quality", "cap"),
+        [("1080p", 1080), ("720p", 720), ("4320p", 4320), ("240p", 240)],
+    )
+    def test_quality_caps(self, quality, cap):
         """測試畫質上限對照表"""
-        from video_downloader import CONSTANTS
-
-        assert CONSTANTS.QUALITY_CAPS["1080p"] == 1080
-        assert CONSTANTS.QUALITY_CAPS["720p"] == 720
-        assert CONSTANTS.QUALITY_CAPS["4320p"] == 4320
-        assert CONSTANTS.QUALITY_CAPS["240p"] == 240
-
-    def test_default_values(self):
-        """測試預設常數值"""
-        from video_downloader import CONSTANTS
-
-        assert CONSTANTS.DEFAULT_TIMEOUT == 10800
-        assert CONSTANTS.DEFAULT_RETRY_COUNT == 3
-        assert CONSTANTS.DEFAULT_RATE_LIMIT == "0"
-        assert CONSTANTS.RETRY_DELAY == 2
-        assert CONSTANTS.COOKIE_UPDATE_INTERVAL == 600
-
-    def test_youtube_key_cookies(self):
-        """測試 YouTube 關鍵 Cookie 名稱"""
-        from video_downloader import CONSTANTS
-
-        assert "SAPISID" in CONSTANTS.YOUTUBE_KEY_COOKIES
-        assert "HSID" in CONSTANTS.YOUTUBE_KEY_COOKIES
-
-    def test_bilibili_key_cookies(self):
-        """測試 Bilibili 關鍵 Cookie 名稱"""
-        from video_downloader import CONSTANTS
-
-        assert "SESSDATA" in CONSTANTS.BILIBILI_KEY_COOKIES
-        assert "bili_jct" in CONSTANTS.BILIBILI_KEY_COOKIES
-        assert "DedeUserID" in CONSTANTS.BILIBILI_KEY_COOKIES
+        assert QUALITY_CAPS[quality] == cap
 
     def test_height_priority(self):
         """測試畫質高度優先順序"""
-        from video_downloader import CONSTANTS
-
-        assert CONSTANTS.HEIGHT_PRIORITY == [4320, 2160, 1440, 1080, 720, 480, 360, 240]
+        assert HEIGHT_PRIORITY == (4320, 2160, 1440, 1080, 720, 480, 360, 240)
         # 確認是由高到低排序
-        for i in range(len(CONSTANTS.HEIGHT_PRIORITY) - 1):
-            assert CONSTANTS.HEIGHT_PRIORITY[i] > CONSTANTS.HEIGHT_PRIORITY[i + 1]
+        for i in range(len(HEIGHT_PRIORITY) - 1):
+            assert HEIGHT_PRIORITY[i] > HEIGHT_PRIORITY[i + 1]
 
 
 class TestDownloadStatsRoundTrip:
@@ -1280,8 +1148,6 @@ class TestDownloadStatsRoundTrip:
 
     def test_round_trip(self):
         """測試 to_dict -> from_dict 往返一致性"""
-        from video_downloader import DownloadStats
-
         original = DownloadStats(
             total_downloads=42,
             successful_downloads=38,
@@ -1303,79 +1169,57 @@ class TestDownloadStatsRoundTrip:
 class TestBatchDownloadWorkerParseProgress:
     """測試 BatchDownloadWorker 的進度解析方法"""
 
-    def test_parse_progress_with_percent(self):
+    def test_parse_progress_with_percent(self, make_batch_worker):
         """測試解析包含百分比的進度行"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker()
 
         line = "[download]  45.2% of 100.00MiB at 5.00MiB/s ETA 00:11"
         result = worker._parse_progress(line)
         assert result != ""
         assert "45.2%" in result
 
-    def test_parse_progress_no_percent(self):
+    def test_parse_progress_no_percent(self, make_batch_worker):
         """測試解析不含百分比的行"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker()
 
         line = "[download] Destination: video.mp4"
         result = worker._parse_progress(line)
         assert result == ""
 
-    def test_parse_progress_complete(self):
+    def test_parse_progress_complete(self, make_batch_worker):
         """測試解析完成進度行"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
+        worker = make_batch_worker()
 
         line = "[download] 100.0% of 50.00MiB at 10.00MiB/s ETA 00:00"
         result = worker._parse_progress(line)
         assert "100.0%" in result
 
 
-class TestDownloadWorkerCancel:
-    """測試 DownloadWorker 取消功能"""
-
-    def test_cancel_sets_flag(self):
-        """測試取消操作設定旗標"""
-        from video_downloader import DownloadWorker
-
-        worker = DownloadWorker(
-            url="https://www.youtube.com/watch?v=test",
-            output_dir="/tmp",
-        )
-        assert worker._is_cancelled is False
-        worker.cancel()
-        assert worker._is_cancelled is True
-
-
-class TestBatchDownloadWorkerControl:
-    """測試 BatchDownloadWorker 控制方法"""
-
-    def test_stop(self):
-        """測試停止功能"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
-        assert worker._is_running is True
-        worker.stop()
-        assert worker._is_running is False
-
-    def test_pause_resume(self):
-        """測試暫停與恢復功能"""
-        from video_downloader import BatchDownloadWorker
-
-        settings = {"download_path": "/tmp"}
-        worker = BatchDownloadWorker(task_id=1, urls=[], settings=settings)
-        assert worker._is_paused is False
+class TestWorkerControlFlags:
+    """測試 DownloadWorker / BatchDownloadWorker 的控制旗標切換"""
+
+    # (worker 種類, 控制方法, 旗標屬性, 呼叫前, 呼叫後)
+    FLAG_CASES: tuple[tuple[str, str, str, bool, bool], ...] = (
+        ("download", "cancel", "_is_cancelled", False, True),
+        ("batch", "stop", "_is_running", True, False),
+        ("batch", "pause", "_is_paused", False, True),
+    )
+
+    @pytest.mark.parametrize(("kind", "method", "attr", "before", "after"), FLAG_CASES)
+    def test_flag_toggle(self, make_batch_worker, kind, method, attr, before, after):
+        """逐一驗證控制方法對應的旗標切換"""
+        if kind == "batch":
+            worker = make_batch_worker()
+        else:
+            worker = DownloadWorker(url="https://www.youtube.com/watch?v=test", output_dir="/tmp")
+        assert getattr(worker, attr) is before
+        getattr(worker, method)()
+        assert getattr(worker, attr) is after
+
+    def test_pause_then_resume(self, make_batch_worker):
+        """暫停後恢復應回到未暫停狀態"""
+        worker = make_batch_worker()
         worker.pause()
-        assert worker._is_paused is True
         worker.resume()
         assert worker._is_paused is False
 
@@ -1385,17 +1229,13 @@ class TestCookieManager:
 
     def test_init(self):
         """測試 CookieManager 初始化"""
-        from video_downloader import CONSTANTS, CookieManager
-
         manager = CookieManager(parent_widget=None)
         assert manager.parent is None
         assert manager.last_update == 0
-        assert manager.update_interval == CONSTANTS.COOKIE_UPDATE_INTERVAL
+        assert manager.update_interval == COOKIE_UPDATE_INTERVAL
 
     def test_validate_youtube_cookies_missing_file(self):
         """測試 YouTube cookie 檔案不存在"""
-        from video_downloader import CookieManager
-
         manager = CookieManager()
         success, msg = manager.validate_youtube_cookies("/nonexistent/cookies.txt")
         assert success is False
@@ -1403,40 +1243,29 @@ class TestCookieManager:
 
     def test_validate_bilibili_cookies_missing_file(self):
         """測試 Bilibili cookie 檔案不存在"""
-        from video_downloader import CookieManager
-
         manager = CookieManager()
         success, result = manager.validate_bilibili_cookies("/nonexistent/cookies.txt")
         assert success is False
         assert "不存在" in result["error"]
 
-    def test_validate_bilibili_cookies_valid_format(self, tmp_path):
+    def test_validate_bilibili_cookies_valid_format(self, valid_bilibili_cookie):
         """測試 Bilibili cookie 檔案格式驗證"""
-        from video_downloader import CookieManager
-
-        cookie_file = tmp_path / "bilibili_cookies.txt"
-        cookie_content = (
-            "# Netscape HTTP Cookie File\n"
-            ".bilibili.com\tTRUE\t/\tFALSE\t0\tSESSDATA\ttest_sessdata\n"
-            ".bilibili.com\tTRUE\t/\tFALSE\t0\tbili_jct\ttest_bili_jct\n"
-            ".bilibili.com\tTRUE\t/\tFALSE\t0\tDedeUserID\ttest_user_id\n"
-        )
-        cookie_file.write_text(cookie_content)
-
         manager = CookieManager()
-        success, result = manager.validate_bilibili_cookies(str(cookie_file))
+        success, result = manager.validate_bilibili_cookies(valid_bilibili_cookie)
         assert success is True
         assert "正確" in result["message"]
 
-    def test_validate_bilibili_cookies_missing_keys(self, tmp_path):
-        """測試 Bilibili cookie 缺少關鍵欄位"""
-        from video_downloader import CookieManager
-
-        cookie_file = tmp_path / "bilibili_cookies.txt"
-        cookie_content = "# Netscape HTTP Cookie File\n.bilibili.com\tTRUE\t/\tFALSE\t0\tSESSDATA\ttest_sessdata\n"
-        cookie_file.write_text(cookie_content)
+    def test_validate_bilibili_cookies_uses_mtime_cache(self, valid_bilibili_cookie):
+        """同一檔案未變動時，重複驗證應命中解析快取"""
+        video_downloader._scan_bilibili_cookie_keys_cached.cache_clear()
+        manager = CookieManager()
+        manager.validate_bilibili_cookies(valid_bilibili_cookie)
+        manager.validate_bilibili_cookies(valid_bilibili_cookie)
+        assert video_downloader._scan_bilibili_cookie_keys_cached.cache_info().hits >= 1
 
+    def test_validate_bilibili_cookies_missing_keys(self, partial_bilibili_cookie):
+        """測試 Bilibili cookie 缺少關鍵欄位"""
         manager = CookieManager()
-        success, result = manager.validate_bilibili_cookies(str(cookie_file))
+        success, result = manager.validate_bilibili_cookies(partial_bilibili_cookie)
         assert success is False
         assert "缺少" in result["error"]
@@ -7,20 +7,23 @@
 from __future__ import annotations
 
 import datetime
-import glob
 import html
+import itertools
 import json
 import os
+import queue
 import re
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-import traceback
-from dataclasses import dataclass, field
-from difflib import SequenceMatcher
-from typing import Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any, Final
 
 from PySide6.QtCore import QObject, QSettings, QSize, Qt, QThread, QTimer, QUrl, Signal
 from PySide6.QtGui import QAction, QDesktopServices, QDragEnterEvent, QDropEvent, QFont, QKeySequence, QShortcut
@@ -56,58 +59,86 @@ import bin_manager
 
 APP_VERSION = "v0.11.0"
 
+# 啟動畫面文字與樣式表固定不變，提升為模組常數（APP_VERSION 於載入時代入）
+WELCOME_MSG: Final[str] = f""" 影片批量下載工具 {APP_VERSION} - PySide6 版本
 
-# ==================== 狀態顏色定義 ====================
-@dataclass
-class StatusColors:
-    """狀態顏色常數"""
-
-    SUCCESS: str = "#4CAF50"  # 綠色 - 成功
-    FAILED: str = "#F44336"  # 紅色 - 失敗
-    SKIPPED: str = "#FFC107"  # 黃色 - 跳過
-    PENDING: str = "#9E9E9E"  # 灰色 - 等待中
-    RUNNING: str = "#2196F3"  # 藍色 - 進行中
-    VALID: str = "#4CAF50"  # 綠色 - 有效
-    INVALID: str = "#F44336"  # 紅色 - 無效
-    UNKNOWN: str = "#FFC107"  # 黃色 - 未驗證
+ 支援平台: YouTube & Bilibili
+ Cookie 提取: Firefox 瀏覽器登入後提取
+ 核心改進:
+    預編譯正規表達式提升效能
+    自動重試機制
+    增強的錯誤處理
 
+等待您的操作...
+"""
 
-STATUS_COLORS = StatusColors()
+STYLESHEET: Final[str] = """
+QMainWindow { background-color: #1e1e1e; color: #d4d4d4; }
+QGroupBox { font-weight: bold; border: 1px solid #3c3c3c; border-radius: 4px; margin-top: 8px; padding-top: 8px; }
+QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }
+QPushButton { background-color: #0e639c; color: white; border: none; border-radius: 4px; padding: 6px 12px; font-weight: bold; }
+QPushButton:hover { background-color: #1177bb; }
+QPushButton:pressed { background-color: #0d5689; }
+QPushButton:disabled { background-color: #3c3c3c; color: #6e6e6e; }
+QLineEdit, QComboBox, QTextEdit { background-color: #3c3c3c; color: #d4d4d4; border: 1px solid #6e6e6e; border-radius: 2px; padding: 4px; }
+QLineEdit:focus, QComboBox:focus { border: 1px solid #0e639c; }
+QTextEdit { font-family: "Consolas", "Monaco", monospace; }
+QProgressBar { border: 1px solid #3c3c3c; border-radius: 4px; text-align: center; background-color: #2d2d30; }
+QProgressBar::chunk { background-color: #0e639c; border-radius: 3px; }
+QTabWidget::pane { border: 1px solid #3c3c3c; background-color: #252526; }
+QTabBar::tab { background-color: #2d2d30; color: #d4d4d4; padding: 8px 16px; border: 1px solid #3c3c3c; }
+QTabBar::tab:selected { background-color: #1e1e1e; border-bottom: 2px solid #0e639c; }
+QCheckBox, QRadioButton { color: #d4d4d4; }
+QLabel { color: #d4d4d4; }
+QToolBar { background-color: #2d2d30; border-bottom: 1px solid #3c3c3c; spacing: 5px; }
+QStatusBar { background-color: #007acc; color: white; }
+"""
 
 
-# ==================== 常數定義 ====================
-@dataclass
-class AppConstants:
-    """應用程式常數"""
-
-    YOUTUBE_KEY_COOKIES: list[str] = field(default_factory=lambda: ["SAPISID", "HSID", "SSID", "APISID"])
-    BILIBILI_KEY_COOKIES: list[str] = field(default_factory=lambda: ["SESSDATA", "bili_jct", "DedeUserID"])
-    VIDEO_EXTENSIONS: tuple[str, ...] = (".mp4", ".webm", ".mkv", ".flv", ".avi", ".mov", ".m4a")
-    IGNORE_SUFFIXES: tuple[str, ...] = (".part", ".ytdl", ".temp", ".aria2")
-    QUALITY_OPTIONS: list[str] = field(
-        default_factory=lambda: ["best", "4320p", "2160p", "1440p", "1080p", "720p", "480p", "360p", "240p", "worst"]
-    )
-    QUALITY_CAPS: dict[str, int] = field(
-        default_factory=lambda: {
-            "4320p": 4320,
-            "2160p": 2160,
-            "1440p": 1440,
-            "1080p": 1080,
-            "720p": 720,
-            "480p": 480,
-            "360p": 360,
-            "240p": 240,
-        }
-    )
-    HEIGHT_PRIORITY: list[int] = field(default_factory=lambda: [4320, 2160, 1440, 1080, 720, 480, 360, 240])
-    DEFAULT_TIMEOUT: int = 10800
-    DEFAULT_RETRY_COUNT: int = 3
-    DEFAULT_RATE_LIMIT: str = "0"
-    RETRY_DELAY: int = 2
-    COOKIE_UPDATE_INTERVAL: int = 600
+# ==================== 狀態顏色定義 ====================
+STATUS_COLORS: Final = MappingProxyType(
+    {
+        "SUCCESS": "#4CAF50",  # 綠色 - 成功
+        "FAILED": "#F44336",  # 紅色 - 失敗
+        "SKIPPED": "#FFC107",  # 黃色 - 跳過
+        "PENDING": "#9E9E9E",  # 灰色 - 等待中
+        "RUNNING": "#2196F3",  # 藍色 - 進行中
+        "VALID": "#4CAF50",  # 綠色 - 有效
+        "INVALID": "#F44336",  # 紅色 - 無效
+        "UNKNOWN": "#FFC107",  # 黃色 - 未驗證
+    }
+)
 
 
-CONSTANTS = AppConstants()
+# ==================== 常數定義 ====================
+# 模組層級不可變常數（tuple / frozenset / MappingProxyType），
+# 熱路徑少一層屬性查找，也避免常數被意外改動
+YOUTUBE_KEY_COOKIES: Final = frozenset({"SAPISID", "HSID", "SSID", "APISID"})
+BILIBILI_KEY_COOKIES: Final = frozenset({"SESSDATA", "bili_jct", "DedeUserID"})
+VIDEO_EXTENSIONS: Final = (".mp4", ".webm", ".mkv", ".flv", ".avi", ".mov", ".m4a")
+IGNORE_SUFFIXES: Final = (".part", ".ytdl", ".temp", ".aria2")
+QUALITY_OPTIONS: Final = ("best", "4320p", "2160p", "1440p", "1080p", "720p", "480p", "360p", "240p", "worst")
+QUALITY_CAPS: Final = MappingProxyType(
+    {
+        "4320p": 4320,
+        "2160p": 2160,
+        "1440p": 1440,
+        "1080p": 1080,
+        "720p": 720,
+        "480p": 480,
+        "360p": 360,
+        "240p": 240,
+    }
+)
+HEIGHT_PRIORITY: Final = (4320, 2160, 1440, 1080, 720, 480, 360, 240)
+DEFAULT_TIMEOUT: Final = 10800
+DEFAULT_RETRY_COUNT: Final = 3
+DEFAULT_RATE_LIMIT: Final = "0"
+RETRY_DELAY: Final = 2
+COOKIE_UPDATE_INTERVAL: Final = 600
+METADATA_CACHE_TTL: Final = 3600
+# yt-dlp flat-playlist 對不可用影片回報的標題標記（已轉小寫比對）
+UNAVAILABLE_TITLES: Final = frozenset({"[deleted video]", "[private video]"})
 
 
 # ==================== 預編譯正規表達式 ====================
@@ -120,32 +151,51 @@ class CompiledPatterns:
     YOUTUBE_EMBED = re.compile(r"/embed/([A-Za-z0-9_-]{6,})")
     YOUTUBE_LIVE = re.compile(r"/live/([A-Za-z0-9_-]{6,})")
     YOUTUBE_PLAYLIST = re.compile(r"[?&]list=([A-Za-z0-9_-]+)")
+    # watch/youtu.be/shorts/embed/live 合併為單一 alternation，一次掃描即可取得影片 ID
+    YOUTUBE_ANY_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{6,})")
     BILIBILI_BV = re.compile(r"/video/(BV[0-9A-Za-z]{10})")
     BILIBILI_AV = re.compile(r"/video/(av\d+)")
     BILIBILI_VIDEO = re.compile(r"bilibili\.com/video/(\w+)")
-    PROGRESS_PERCENT = re.compile(r"(\d+\.\d+)%")
-    PROGRESS_SIZE = re.compile(r"of\s+([\d.]+\s*[KMGT]?i?B)")
-    PROGRESS_SPEED = re.compile(r"at\s+([\d.]+\s*[KMGT]?i?B/s)")
-    PROGRESS_ETA = re.compile(r"ETA\s+(\d+:\d+)")
-    DOWNLOAD_SPEED = re.compile(r"(\d+\.?\d*)\s*([KMGT]?i?B)/s")
-    DOWNLOAD_ETA = re.compile(r"ETA\s*(\d+:\d+)")
-    FILE_SIZE = re.compile(r"([\d.]+)(k|m|g|t)i?b", re.IGNORECASE)
+    # 百分比/大小/速度/ETA 一次掃描取得；後三者為選配欄位，speed_num 供只要數字的呼叫端使用
+    PROGRESS_ALL = re.compile(
+        r"(?P<pct>\d+\.\d+)%"
+        r"(?:.*?\bof\s+~?\s*(?P<size>[\d.]+\s*[KMGT]?i?B))?"
+        r"(?:.*?\bat\s+(?P<speed>(?P<speed_num>[\d.]+)\s*[KMGT]?i?B/s))?"
+        r"(?:.*?\bETA\s+(?P<eta>\d+:\d+))?"
+    )
+    FILE_SIZE = re.compile(r"([\d.]+)([kmgt])i?b", re.IGNORECASE)
     BRACKET_ID = re.compile(r"\[([A-Za-z0-9_-]{8,})\]")
+    # 播放清單 URL 判斷；IGNORECASE 省去每次比對前的 lower() 複製
+    PLAYLIST_URL = re.compile(r"list=|playlist", re.IGNORECASE)
+    # Netscape cookie 行中的 Bilibili 關鍵 cookie（名稱位於第 6 欄）
+    BILI_COOKIE_LINE = re.compile(
+        r"^[^#\s][^\n]*?\t[^\n]*?\t[^\n]*?\t[^\n]*?\t[^\n]*?\t(SESSDATA|bili_jct|DedeUserID)\t([^\n]+)",
+        re.MULTILINE,
+    )
 
 
 PATTERNS = CompiledPatterns()
 
 
-def atomic_write_json(file_path: str | os.PathLike[str], data: Any):
-    """Atomically write JSON to avoid leaving a corrupt state file on crash."""
+@lru_cache(maxsize=4096)
+def _normalize_path_cached(path: str) -> str:
+    """Cached path canonicalization; the same few paths are re-normalized constantly during playlist checks."""
+    # abspath 內部已做 normpath，不需要再額外跑一次
+    return os.path.normcase(os.path.abspath(path))
+
+
+def atomic_write_text(file_path: str | os.PathLike[str], text: str):
+    """Atomically write text to avoid leaving a corrupt state file on crash."""
     target = os.fspath(file_path)
     target_dir = os.path.dirname(os.path.abspath(target)) or "."
     os.makedirs(target_dir, exist_ok=True)
     fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".tmp", dir=target_dir)
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.write("\n")
+            f.write(text)
+            # rename 只保證目錄項目原子性；先 fsync 確保斷電時不會換入空殼檔案
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp_path, target)
     except Exception:
         try:
@@ -155,6 +205,11 @@ def atomic_write_json(file_path: str | os.PathLike[str], data: Any):
         raise
 
 
+def atomic_write_json(file_path: str | os.PathLike[str], data: Any):
+    """Atomically write JSON to avoid leaving a corrupt state file on crash."""
+    atomic_write_text(file_path, json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+
+
 def migrate_playlist_state_paths(
     playlist_states: dict,
     download_history: dict,
@@ -197,7 +252,9 @@ def render_download_report_html(download_history: dict) -> str:
     total_count = sum(len(v) for v in download_history.values())
     generated_at = html.escape(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
-    html_content = f"""<!DOCTYPE html>
+    # 以 list + join 累積片段；str += 會在每列重新複製整份越長越大的字串
+    parts = [
+        f"""<!DOCTYPE html>
 <html lang="zh-TW">
 <head>
     <meta charset="UTF-8">
@@ -229,6 +286,7 @@ def render_download_report_html(download_history: dict) -> str:
             <th>下載時間</th>
         </tr>
 """
+    ]
 
     for path, videos in download_history.items():
         safe_path = html.escape(str(path))
@@ -237,18 +295,20 @@ def render_download_report_html(download_history: dict) -> str:
             safe_video_id = html.escape(str(video_id))
             title = html.escape(str(info.get("title", "") or video_id))
             timestamp = html.escape(str(info.get("timestamp", "")))
-            html_content += f"""        <tr>
+            parts.append(
+                f"""        <tr>
             <td>{safe_path}</td>
             <td><a href="{url}" target="_blank">{safe_video_id}</a></td>
             <td>{title}</td>
             <td>{timestamp}</td>
         </tr>
 """
+            )
 
-    html_content += """    </table>
+    parts.append("""    </table>
 </body>
-</html>"""
-    return html_content
+</html>""")
+    return "".join(parts)
 
 
 def summarize_playlist_check_results(results: list[dict]) -> dict:
@@ -336,24 +396,57 @@ def remove_remembered_playlist(playlist_states: dict, download_path: str, playli
     return True
 
 
+def prune_metadata_cache(cache: dict, now: float, ttl: float = METADATA_CACHE_TTL) -> dict:
+    """Drop expired or malformed entries from a metadata cache of {url: [timestamp, metadata]}."""
+    pruned = {}
+    for url, entry in cache.items():
+        if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+            continue
+        timestamp, metadata = entry
+        if isinstance(timestamp, (int, float)) and isinstance(metadata, dict) and now - timestamp < ttl:
+            pruned[url] = [timestamp, metadata]
+    return pruned
+
+
 def fetch_playlist_batch_metadata(
     playlist_jobs: list[dict],
     fetch_metadata,
     should_cancel=None,
     on_progress=None,
+    max_workers: int = 8,
 ) -> tuple[list[tuple[dict, dict | None]], bool]:
-    """Fetch playlist metadata sequentially with progress and cooperative cancellation."""
-    results = []
+    """Fetch playlist metadata concurrently with progress and cooperative cancellation.
+
+    Each fetch is an independent yt-dlp subprocess, so a small thread pool overlaps the
+    network waits; results keep the job order. Cancellation is cooperative: a job that
+    sees the cancel flag before fetching is skipped and the batch reports cancelled.
+    """
     total = len(playlist_jobs)
-    for index, job in enumerate(playlist_jobs, start=1):
+    if not total:
+        return [], False
+    progress_lock = threading.Lock()
+    started_count = itertools.count(1)
+    skipped = object()
+
+    def fetch_one(job: dict):
         if should_cancel and should_cancel():
-            return results, True
-        title = job.get("playlist_title") or job.get("playlist_id") or job.get("playlist_url") or "未命名清單"
+            return skipped
         if on_progress:
-            on_progress(index, total, str(title))
-        metadata = fetch_metadata(job["playlist_url"])
-        results.append((job, metadata))
-    return results, False
+            title = job.get("playlist_title") or job.get("playlist_id") or job.get("playlist_url") or "未命名清單"
+            with progress_lock:
+                on_progress(next(started_count), total, str(title))
+        return fetch_metadata(job["playlist_url"])
+
+    slots: list[tuple[dict, dict | None] | object] = [skipped] * total
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as executor:
+        futures = {executor.submit(fetch_one, job): index for index, job in enumerate(playlist_jobs)}
+        for future in as_completed(futures):
+            metadata = future.result()
+            if metadata is not skipped:
+                index = futures[future]
+                slots[index] = (playlist_jobs[index], metadata)
+    results = [entry for entry in slots if entry is not skipped]
+    return results, len(results) < total
 
 
 def append_cancelled_playlist_results(playlist_jobs: list[dict], processed_results: list[dict]):
@@ -402,7 +495,7 @@ def task_completion_dialog_level(stats: dict) -> str | None:
 
 
 # ==================== 下載統計 ====================
-@dataclass
+@dataclass(slots=True)
 class DownloadStats:
     """下載統計資料"""
 
@@ -414,37 +507,23 @@ class DownloadStats:
     total_time_seconds: int = 0
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            "total_downloads": self.total_downloads,
-            "successful_downloads": self.successful_downloads,
-            "failed_downloads": self.failed_downloads,
-            "skipped_downloads": self.skipped_downloads,
-            "total_bytes_downloaded": self.total_bytes_downloaded,
-            "total_time_seconds": self.total_time_seconds,
-        }
+        return asdict(self)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> DownloadStats:
-        return cls(
-            total_downloads=data.get("total_downloads", 0),
-            successful_downloads=data.get("successful_downloads", 0),
-            failed_downloads=data.get("failed_downloads", 0),
-            skipped_downloads=data.get("skipped_downloads", 0),
-            total_bytes_downloaded=data.get("total_bytes_downloaded", 0),
-            total_time_seconds=data.get("total_time_seconds", 0),
-        )
+        # 只取已知欄位，缺少的交給 dataclass 預設值，多餘的鍵直接忽略
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
 
     def format_bytes(self, bytes_count: int) -> str:
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if bytes_count < 1024:
-                return f"{bytes_count:.2f} {unit}"
-            bytes_count /= 1024
-        return f"{bytes_count:.2f} PB"
+        units = ("B", "KB", "MB", "GB", "TB", "PB")
+        # bit_length 直接算出 1024 的冪次，免去逐級除以 1024 的迴圈
+        idx = 0 if bytes_count < 1 else min(5, (int(bytes_count).bit_length() - 1) // 10)
+        return f"{bytes_count / (1 << (idx * 10)):.2f} {units[idx]}"
 
     def get_summary(self) -> str:
         success_rate = (self.successful_downloads / self.total_downloads * 100) if self.total_downloads > 0 else 0
-        hours = self.total_time_seconds // 3600
-        minutes = (self.total_time_seconds % 3600) // 60
+        hours, remainder = divmod(self.total_time_seconds, 3600)
+        minutes = remainder // 60
         return (
             f" 下載統計\n"
             f"總下載數: {self.total_downloads}\n"
@@ -457,19 +536,46 @@ class DownloadStats:
 
 
 # ==================== 平台識別與工具函式 ====================
+@lru_cache(maxsize=8192)
+def _detect_platform_cached(url: str) -> str:
+    # 只取出 host 來判斷，避免對整條 URL 做 lowercase 複製與全文掃描
+    scheme_end = url.find("://")
+    host = (url[scheme_end + 3 :] if scheme_end >= 0 else url).partition("/")[0].lower()
+    if host.endswith(("youtube.com", "youtu.be")):
+        return "youtube"
+    if host.endswith(("bilibili.com", "b23.tv")):
+        return "bilibili"
+    return "unknown"
+
+
+@lru_cache(maxsize=8192)
+def _extract_video_id_cached(url: str) -> str:
+    platform = _detect_platform_cached(url)
+    if platform == "youtube":
+        match = PATTERNS.YOUTUBE_ANY_ID.search(url) or PATTERNS.YOUTUBE_PLAYLIST.search(url)
+        if match:
+            return match.group(1)
+    elif platform == "bilibili":
+        for pattern in [PATTERNS.BILIBILI_BV, PATTERNS.BILIBILI_AV, PATTERNS.BILIBILI_VIDEO]:
+            match = pattern.search(url)
+            if match:
+                return f"bili_{match.group(1)}"
+    return url.strip()
+
+
+def clear_url_caches():
+    """批次任務結束時釋放 URL 解析快取，避免長駐大量一次性 URL。"""
+    _detect_platform_cached.cache_clear()
+    _extract_video_id_cached.cache_clear()
+
+
 class PlatformUtils:
     """平台相關工具函式"""
 
     @staticmethod
     def detect_platform(url: str) -> str:
         """自動識別網址平台類型"""
-        url_lower = url.lower()
-        if any(x in url_lower for x in ["youtube.com", "youtu.be"]):
-            return "youtube"
-        elif any(x in url_lower for x in ["bilibili.com", "b23.tv"]):
-            return "bilibili"
-        else:
-            return "unknown"
+        return _detect_platform_cached(url)
 
     @staticmethod
     def resolve_platform(url: str, selected_platform: str = "auto") -> str:
@@ -482,25 +588,7 @@ class PlatformUtils:
     @staticmethod
     def extract_video_id(url: str) -> str:
         """提取影片 ID (支援 YouTube & Bilibili)"""
-        platform = PlatformUtils.detect_platform(url)
-        if platform == "youtube":
-            for pattern in [
-                PATTERNS.YOUTUBE_VIDEO_ID,
-                PATTERNS.YOUTUBE_SHORT_URL,
-                PATTERNS.YOUTUBE_SHORTS,
-                PATTERNS.YOUTUBE_EMBED,
-                PATTERNS.YOUTUBE_LIVE,
-                PATTERNS.YOUTUBE_PLAYLIST,
-            ]:
-                match = pattern.search(url)
-                if match:
-                    return match.group(1)
-        elif platform == "bilibili":
-            for pattern in [PATTERNS.BILIBILI_BV, PATTERNS.BILIBILI_AV, PATTERNS.BILIBILI_VIDEO]:
-                match = pattern.search(url)
-                if match:
-                    return f"bili_{match.group(1)}"
-        return url.strip()
+        return _extract_video_id_cached(url)
 
     @staticmethod
     def extract_playlist_id(url: str) -> str:
@@ -512,43 +600,65 @@ class PlatformUtils:
 
 
 # ==================== Cookie 管理器 ====================
+@lru_cache(maxsize=4)
+def _key_cookie_pattern(key_cookies: tuple[str, ...]) -> re.Pattern[str]:
+    """將關鍵 cookie 名稱編成單一 alternation，一次掃描即可找出全部出現者。"""
+    return re.compile("|".join(map(re.escape, key_cookies)))
+
+
+@lru_cache(maxsize=16)
+def _scan_bilibili_cookie_keys_cached(path: str, mtime: float) -> frozenset[str]:
+    """單次 regex 掃描 cookie 檔，只取出現的關鍵 cookie 名稱；以 (路徑, mtime) 為快取鍵。"""
+    with open(path, encoding="utf-8") as f:
+        return frozenset(match.group(1) for match in PATTERNS.BILI_COOKIE_LINE.finditer(f.read()))
+
+
+def _scan_bilibili_cookie_keys(path: str) -> frozenset[str]:
+    """讀取 cookie 檔；檔案未變動時（mtime 相同）直接命中快取，不重讀磁碟。"""
+    return _scan_bilibili_cookie_keys_cached(path, os.path.getmtime(path))
+
+
 class CookieManager:
     """Cookie 提取與管理"""
 
     def __init__(self, parent_widget=None):
         self.parent = parent_widget
         self.last_update = 0
-        self.update_interval = CONSTANTS.COOKIE_UPDATE_INTERVAL
+        self.update_interval = COOKIE_UPDATE_INTERVAL
 
     def _extract_firefox_cookies(
         self,
         output_file: str,
         platform: str,
         test_urls: list[dict[str, list[str]]],
-        key_cookies: list[str],
+        key_cookies: frozenset[str],
         fail_message: str,
     ) -> tuple[bool, str]:
         """從 Firefox 提取指定平台的 Cookies（共用邏輯）"""
         try:
             for method in test_urls:
                 try:
+                    # 不讀取輸出，維持 bytes 模式即可，省去 TextIOWrapper 與逐段 decode
                     result = subprocess.run(
                         bin_manager.get_base_ytdlp_cmd() + method["args"],
                         capture_output=True,
-                        text=True,
-                        encoding="utf-8",
-                        errors="replace",
                         timeout=45,
                         env=bin_manager.get_ytdlp_env(),
                     )
-                    if result.returncode == 0 and os.path.exists(output_file):
-                        file_size = os.path.getsize(output_file)
+                    if result.returncode == 0:
+                        # 直接讀取取代 exists/getsize/open 三次 syscall；檔案不存在視同提取失敗
+                        try:
+                            with open(output_file, "rb") as f:
+                                raw = f.read()
+                        except OSError:
+                            continue
+                        file_size = len(raw)
                         if file_size < 100:
                             continue
-                        with open(output_file, encoding="utf-8") as f:
-                            content = f.read()
-                        found_keys = [k for k in key_cookies if k in content]
-                        missing_keys = [k for k in key_cookies if k not in found_keys]
+                        content = raw.decode("utf-8", "replace")
+                        found = set(_key_cookie_pattern(tuple(sorted(key_cookies))).findall(content))
+                        found_keys = sorted(key_cookies & found)
+                        missing_keys = sorted(key_cookies - found)
                         if platform == "youtube":
                             return (
                                 True,
@@ -599,7 +709,7 @@ class CookieManager:
             output_file,
             "youtube",
             methods,
-            CONSTANTS.YOUTUBE_KEY_COOKIES,
+            YOUTUBE_KEY_COOKIES,
             "所有提取方法都失敗。請確認:\n1. Firefox 已安裝並登入 YouTube\n2. 已關閉所有 Firefox 視窗",
         )
 
@@ -637,7 +747,7 @@ class CookieManager:
             output_file,
             "bilibili",
             methods,
-            CONSTANTS.BILIBILI_KEY_COOKIES,
+            BILIBILI_KEY_COOKIES,
             "所有提取方法都失敗。",
         )
 
@@ -658,9 +768,6 @@ class CookieManager:
                     "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
                 ],
                 capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 timeout=15,
                 env=bin_manager.get_ytdlp_env(),
             )
@@ -675,15 +782,8 @@ class CookieManager:
         if not os.path.exists(cookie_file):
             return False, {"error": "Cookie 檔案不存在"}
         try:
-            cookies = {}
-            with open(cookie_file, encoding="utf-8") as f:
-                for line in f:
-                    if line.startswith("#") or not line.strip():
-                        continue
-                    parts = line.strip().split("\t")
-                    if len(parts) >= 7:
-                        cookies[parts[5]] = parts[6]
-            missing = [c for c in CONSTANTS.BILIBILI_KEY_COOKIES if c not in cookies]
+            found = _scan_bilibili_cookie_keys(cookie_file)
+            missing = sorted(BILIBILI_KEY_COOKIES - found)
             if missing:
                 return False, {"error": f"缺少關鍵 Cookie: {', '.join(missing)}"}
             return True, {"message": "Cookies 檔案格式正確"}
@@ -712,6 +812,56 @@ class AsyncWorker(QThread):
             self.error.emit(str(e))
 
 
+class PersistWorker(threading.Thread):
+    """背景 JSON 持久化執行緒。
+
+    呼叫端排入資料快照（鎖內淺複製、內層只會整顆替換的 dict），序列化與
+    檔案 I/O 都在本執行緒進行；每個 flush 週期內同一路徑只序列化並寫入
+    最後一份快照，500 部影片的清單下載只會產生少數幾次完整 json.dumps，
+    而非每部影片一次。不發 Qt signal，因此用 daemon threading.Thread 而非
+    QThread，視窗被直接銷毀時也不會卡住程序。
+    """
+
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self):
+        super().__init__(daemon=True, name="persist-worker")
+        self._queue: queue.Queue = queue.Queue()
+
+    def submit(self, file_path: str, data: Any):
+        """將資料快照排入寫檔佇列（序列化延後到 flush 時才做）"""
+        self._queue.put((file_path, data))
+
+    def commit(self):
+        """送出結束訊號並等待所有排隊中的寫入完成（關閉程式時呼叫）"""
+        self._queue.put(None)
+        self.join()
+
+    def run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = {item[0]: item[1]}
+            # 等一個 flush 週期收集後續寫入，同一路徑只保留最後的快照
+            time.sleep(self.FLUSH_INTERVAL)
+            while True:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                pending[nxt[0]] = nxt[1]
+            for file_path, data in pending.items():
+                try:
+                    atomic_write_text(file_path, json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+                except OSError:
+                    pass
+
+
 class PlaylistBatchCheckWorker(QThread):
     """Fetch remembered playlist metadata with progress and cooperative cancellation."""
 
@@ -754,6 +904,29 @@ class DownloadSignals(QObject):
     speed = Signal(str, str, str)  # video_id, speed, eta
 
 
+def _iter_marked_lines(stream, markers: tuple[bytes, ...]):
+    """以最多 64KB 的區塊讀取 bytes pipe，只 decode 含指定標記的行。
+
+    yt-dlp 的輸出大多是用不到的 fragment 記錄；text-mode 搭配 bufsize=1 會對
+    每一行做一次 decode 與 readline 呼叫，先在 bytes 層過濾可跳過絕大多數行。
+    """
+    buffer = bytearray()
+    # read1 最多做一次 OS read、有資料就回傳；read(65536) 會等到湊滿 64KB 或 EOF，
+    # 進度行會整批延後湧出，取消檢查也會跟著卡住
+    while chunk := stream.read1(65536):
+        # \r（進度重繪）視同換行，維持 text-mode universal newlines 的切行行為
+        buffer += chunk.replace(b"\r", b"\n")
+        if b"\n" not in buffer:
+            continue
+        lines = buffer.split(b"\n")
+        buffer = bytearray(lines.pop())
+        for raw in lines:
+            if any(marker in raw for marker in markers):
+                yield raw.decode("utf-8", "replace")
+    if buffer and any(marker in buffer for marker in markers):
+        yield buffer.decode("utf-8", "replace")
+
+
 # ==================== 下載工作執行緒 ====================
 class DownloadWorker(QThread):
     """下載工作執行緒 - 支援重試與速度限制"""
@@ -783,7 +956,7 @@ class DownloadWorker(QThread):
         self.sub_langs = sub_langs
         self.cookie_file = cookie_file
         self.video_id = video_id or PlatformUtils.extract_video_id(url)
-        self.max_retries = max_retries or CONSTANTS.DEFAULT_RETRY_COUNT
+        self.max_retries = max_retries or DEFAULT_RETRY_COUNT
         self.rate_limit = rate_limit
         self._is_cancelled = False
         self.process = None
@@ -812,7 +985,7 @@ class DownloadWorker(QThread):
                 return
             if attempt > 0:
                 self.log_message.emit(f"[{self.video_id}] 重試 {attempt}/{self.max_retries - 1}...")
-                time.sleep(CONSTANTS.RETRY_DELAY * attempt)
+                time.sleep(RETRY_DELAY * attempt)
             success, message = self._download_once()
             if success or self._is_cancelled:
                 self.download_finished.emit(self.video_id, success, message)
@@ -834,14 +1007,11 @@ class DownloadWorker(QThread):
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 startupinfo=startupinfo,
-                bufsize=1,
+                bufsize=65536,
                 env=bin_manager.get_ytdlp_env(),
             )
-            for line in iter(self.process.stdout.readline, ""):
+            for line in _iter_marked_lines(self.process.stdout, (b"[download]", b"[info]")):
                 if self._is_cancelled:
                     self.process.terminate()
                     return False, "已取消"
@@ -892,23 +1062,17 @@ class DownloadWorker(QThread):
         return cmd
 
     def _parse_progress(self, line: str):
-        """解析進度輸出"""
+        """解析進度輸出（百分比/速度/ETA 單次掃描取得）"""
         line = line.strip()
         if not line:
             return
-        progress_match = PATTERNS.PROGRESS_PERCENT.search(line)
-        if progress_match:
-            try:
-                percent = float(progress_match.group(1))
-                self.progress_update.emit(self.video_id, percent, "下載中")
-            except ValueError:
-                pass
-        speed_match = PATTERNS.DOWNLOAD_SPEED.search(line)
-        eta_match = PATTERNS.DOWNLOAD_ETA.search(line)
-        if speed_match:
-            speed = speed_match.group(1)
-            eta = eta_match.group(1) if eta_match else "--:--"
-            self.speed_update.emit(self.video_id, speed, eta)
+        if "%" in line:
+            match = PATTERNS.PROGRESS_ALL.search(line)
+            if match:
+                self.progress_update.emit(self.video_id, float(match.group("pct")), "下載中")
+                speed = match.group("speed_num")
+                if speed:
+                    self.speed_update.emit(self.video_id, speed, match.group("eta") or "--:--")
         if "[download]" in line or "[info]" in line:
             self.log_message.emit(f"[{self.video_id}] {line}")
 
@@ -929,6 +1093,8 @@ class BatchDownloadWorker(QThread):
         self.urls = urls
         self.settings = settings
         self.main_window = main_window
+        # settings 在任務執行期間不變，同平台的指令前綴只建構一次
+        self._base_cmd_cache: dict[tuple[str, bool], tuple[str, ...]] = {}
         self._is_running = True
         self._is_paused = False
         self.stats = {"success": 0, "failed": 0, "skipped": 0}
@@ -939,6 +1105,11 @@ class BatchDownloadWorker(QThread):
             start_time = time.time()
             self.log_message.emit(f" 任務 #{self.task_id} 開始 ({len(self.urls)} 個項目)")
 
+            download_path = self.settings.get("download_path", "")
+            local_files = []
+            if self.main_window and download_path:
+                local_files = self.main_window.list_local_video_files(download_path)
+
             for idx, url in enumerate(self.urls, 1):
                 if not self._is_running:
                     break
@@ -955,10 +1126,9 @@ class BatchDownloadWorker(QThread):
                 self.log_message.emit(f"\n [{idx}/{len(self.urls)}] {url}")
                 self.log_message.emit(f" 平台: {platform}, ID: {video_id}")
 
-                # 檢查是否已下載
-                download_path = self.settings.get("download_path", "")
+                # 檢查是否已下載（使用批次開始時建立的目錄索引）
                 if self.main_window and download_path:
-                    if self.main_window.is_downloaded(download_path, video_id):
+                    if self.main_window.is_downloaded(download_path, video_id, local_file_names=local_files):
                         self.stats["skipped"] += 1
                         self.log_message.emit(" 已下載過，跳過")
                         continue
@@ -971,6 +1141,8 @@ class BatchDownloadWorker(QThread):
                     self.log_message.emit(" 下載成功")
                     if self.main_window and download_path:
                         self.main_window.add_to_download_history(download_path, video_id, url, title=None)
+                        # 將新檔案補進索引，批次內重複的 URL 才不會重新下載
+                        local_files.append(f"[{video_id}]{VIDEO_EXTENSIONS[0]}")
                 else:
                     self.stats["failed"] += 1
                     self.log_message.emit(" 下載失敗")
@@ -989,8 +1161,12 @@ class BatchDownloadWorker(QThread):
             self.task_finished.emit(self.stats)
 
         except (OSError, subprocess.SubprocessError) as e:
+            import traceback
+
             self.log_message.emit(f" 任務錯誤: {str(e)}")
             traceback.print_exc()
+        finally:
+            clear_url_caches()
 
     def _resolve_platform(self, url: str) -> str:
         """解析下載平台，尊重 UI 的手動平台選擇。"""
@@ -1002,7 +1178,7 @@ class BatchDownloadWorker(QThread):
             cmd = self._build_ytdlp_command(url, platform)
             self.log_message.emit(f" 執行: {' '.join(cmd[:5])}...")
 
-            timeout = self.settings.get("download_timeout", CONSTANTS.DEFAULT_TIMEOUT)
+            timeout = self.settings.get("download_timeout", DEFAULT_TIMEOUT)
 
             success = self._run_ytdlp_command(cmd, timeout)
             if success:
@@ -1024,25 +1200,22 @@ class BatchDownloadWorker(QThread):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
             cwd=self.settings.get("download_path"),
-            bufsize=1,
+            bufsize=65536,
             env=bin_manager.get_ytdlp_env(),
         )
 
         last_progress = ""
         has_successful_download = False
         try:
-            for line in iter(process.stdout.readline, ""):
+            interesting = (b"[download]", b"ERROR", b"WARNING", b"[Merger]", b"Deleting original file")
+            for line in _iter_marked_lines(process.stdout, interesting):
                 if not self._is_running:
                     process.terminate()
                     break
-                line = line.strip()
-                if not line:
-                    continue
-                if "[download]" in line:
+                # yt-dlp 的標記都在行首；startswith 對 tuple 是單次 C-level 前綴比對，
+                # 行尾也沒有換行（_iter_marked_lines 已切行），不需再 strip
+                if line.startswith("[download]"):
                     progress_info = self._parse_progress(line)
                     if progress_info and progress_info != last_progress:
                         self.download_progress.emit(progress_info)
@@ -1050,9 +1223,9 @@ class BatchDownloadWorker(QThread):
                     # 偵測下載完成的標記
                     if "has already been downloaded" in line or "100%" in line:
                         has_successful_download = True
-                elif "ERROR" in line or "WARNING" in line:
+                elif line.startswith(("ERROR", "WARNING")):
                     self.log_message.emit(f" {line}")
-                elif "[Merger]" in line or "Deleting original file" in line:
+                elif line.startswith("[Merger]") or "Deleting original file" in line:
                     has_successful_download = True
 
             process.stdout.close()
@@ -1082,7 +1255,7 @@ class BatchDownloadWorker(QThread):
         try:
             cleaned = 0
             for name in os.listdir(download_path):
-                if name.endswith(CONSTANTS.IGNORE_SUFFIXES):
+                if name.endswith(IGNORE_SUFFIXES):
                     file_path = os.path.join(download_path, name)
                     try:
                         os.remove(file_path)
@@ -1096,31 +1269,29 @@ class BatchDownloadWorker(QThread):
 
     def _parse_progress(self, line: str) -> str:
         """解析進度輸出 (使用預編譯 regex)"""
-        try:
-            if "%" in line:
-                parts = []
-                percent_match = PATTERNS.PROGRESS_PERCENT.search(line)
-                size_match = PATTERNS.PROGRESS_SIZE.search(line)
-                speed_match = PATTERNS.PROGRESS_SPEED.search(line)
-                eta_match = PATTERNS.PROGRESS_ETA.search(line)
-
-                if percent_match:
-                    parts.append(f" {percent_match.group(1)}%")
-                if size_match:
-                    parts.append(f" {size_match.group(1)}")
-                if speed_match:
-                    parts.append(f" {speed_match.group(1)}")
-                if eta_match:
-                    parts.append(f" {eta_match.group(1)}")
-
-                if parts:
-                    return " | ".join(parts)
-        except (ValueError, AttributeError):
-            pass
-        return ""
-
-    def _build_ytdlp_command(self, url: str, platform: str, disable_cookies: bool = False) -> list[str]:
-        """建構 yt-dlp 指令"""
+        if "%" not in line:
+            return ""
+        match = PATTERNS.PROGRESS_ALL.search(line)
+        if not match:
+            return ""
+        parts = [f" {match.group('pct')}%"]
+        for name in ("size", "speed", "eta"):
+            value = match.group(name)
+            if value:
+                parts.append(f" {value}")
+        return " | ".join(parts)
+
+    def _build_ytdlp_command(self, url: str, platform: str, disable_cookies: bool = False) -> tuple[str, ...]:
+        """建構 yt-dlp 指令；不變的前綴依 (平台, 停用 cookie) 快取為 tuple，每個 URL 只附加網址"""
+        key = (platform, disable_cookies)
+        base = self._base_cmd_cache.get(key)
+        if base is None:
+            base = tuple(self._build_base_ytdlp_cmd(platform, disable_cookies))
+            self._base_cmd_cache[key] = base
+        return (*base, url)
+
+    def _build_base_ytdlp_cmd(self, platform: str, disable_cookies: bool) -> list[str]:
+        """展開 settings 決策樹，產生不含 URL 的指令前綴"""
         cmd = bin_manager.get_base_ytdlp_cmd()
 
         if self.settings.get("use_cookies") and not disable_cookies:
@@ -1152,8 +1323,8 @@ class BatchDownloadWorker(QThread):
             cmd.extend(["-f", "bestvideo+bestaudio/best"])
         elif quality == "worst":
             cmd.extend(["-f", "worstvideo+worstaudio/worst"])
-        elif quality in CONSTANTS.QUALITY_CAPS:
-            height = CONSTANTS.QUALITY_CAPS[quality]
+        elif quality in QUALITY_CAPS:
+            height = QUALITY_CAPS[quality]
             cmd.extend(["-f", f"bestvideo[height<={height}]+bestaudio/best[height<={height}]"])
         else:
             cmd.extend(["-f", quality])
@@ -1187,7 +1358,6 @@ class BatchDownloadWorker(QThread):
                 ]
             )
 
-        cmd.append(url)
         return cmd
 
     def stop(self):
@@ -1211,13 +1381,10 @@ class MainWindow(QMainWindow):
 
         self.workers = []
         self._async_workers = []
-        self.global_seen_ids = set()
-        self._seen_ids_lock = threading.Lock()
-        self._history_lock = threading.Lock()
+        self._history_lock = threading.RLock()
         self.batch_check_worker: PlaylistBatchCheckWorker | None = None
         self.suppressed_completion_dialog_task_ids = set()
         self.cookie_manager = CookieManager(self)
-        self.settings = QSettings("VideoDownloader", "PySide6App")
 
         self.download_history_file = "download_history.json"
         self.download_history = {}
@@ -1225,25 +1392,78 @@ class MainWindow(QMainWindow):
         self.playlist_states = {}
         self.playlist_updates_log_file = "playlist_updates_log.json"
         self.playlist_updates_log = []
+        # 播放清單 metadata 快取：url -> [抓取時間戳, metadata]，TTL 內重複檢查免跑 yt-dlp
+        self.metadata_cache_file = "metadata_cache.json"
+        self._metadata_cache: dict[str, list] = {}
+        self._metadata_cache_lock = threading.Lock()
 
         self.youtube_cookie_file = ""
         self.bilibili_cookie_file = ""
 
+        self._persist_worker = PersistWorker()
+        self._persist_worker.start()
+
+        # cwd 在 GUI 程式生命週期內不變，快取後組 cookie 路徑不必每次 abspath/getcwd
+        self._cwd = os.getcwd()
+        # cookie 檔名流水號；time.time() 在 1 秒內連點會撞名
+        self._extract_counter = itertools.count(1)
+
+        # exists/isdir 探測快取：(path, probe 名稱) -> (時間戳, 結果)，TTL 2 秒
+        self._path_probe_cache: dict[tuple[str, str], tuple[float, bool]] = {}
+        # 下載資料夾索引快取：path -> (目錄 mtime, 影片檔名, bracket id 集合)
+        self._dir_index_cache: dict[str, tuple[float, list[str], set[str]]] = {}
+
         self.init_ui()
+        # 次要設定群組與設定值載入延後到事件圈第一輪（使用者輸入尚未開始處理）
+        QTimer.singleShot(0, self._build_deferred_groups)
+        # 歷史/播放清單 JSON 延後到事件圈第一輪再載入，讓視窗先完成首次繪製；
+        # in-memory dict 已初始化為空，載入完成前觸發的 UI 操作不會出錯
+        QTimer.singleShot(0, self._deferred_load_state)
+
+        QTimer.singleShot(1000, self.check_dependencies)
+        QTimer.singleShot(2000, self.auto_check_all_playlists_on_start)
+
+    def _build_deferred_groups(self):
+        """建立延後的設定群組並載入設定（load_settings 依賴這些 widget）"""
+        layout = self._deferred_groups_layout
+        index = self._deferred_groups_index
+        for build in (self.create_download_settings_group, self.create_cookie_group, self.create_subtitle_group):
+            layout.insertWidget(index, build())
+            index += 1
         self.load_settings()
+
+    def _deferred_load_state(self):
+        """載入下載歷史與播放清單狀態（於視窗顯示後執行，避免阻塞啟動）"""
         self.load_download_history()
         self.load_playlist_states()
         self.load_playlist_updates_log()
+        self.load_metadata_cache()
         self.refresh_remembered_playlist_list()
 
-        QTimer.singleShot(1000, self.check_dependencies)
-        QTimer.singleShot(2000, self.auto_check_all_playlists_on_start)
+    PATH_PROBE_TTL = 2.0
+
+    @cached_property
+    def settings(self) -> QSettings:
+        """延後到第一次存取才開啟 QSettings 後端（Windows 上是 registry I/O）"""
+        return QSettings("VideoDownloader", "PySide6App")
+
+    def _probe_path(self, path: str, probe=os.path.exists) -> bool:
+        """帶 TTL 的 exists/isdir 快取，避免每次開始下載都重複 stat 同樣的路徑"""
+        now = time.monotonic()
+        key = (path, probe.__name__)
+        cached = self._path_probe_cache.get(key)
+        if cached and now - cached[0] < self.PATH_PROBE_TTL:
+            return cached[1]
+        result = probe(path)
+        self._path_probe_cache[key] = (now, result)
+        return result
 
     @staticmethod
     def normalize_path(path: str) -> str:
+        # 空值在進快取前就擋掉，避免 hash None
         if not path:
             return ""
-        return os.path.normcase(os.path.abspath(os.path.normpath(path)))
+        return _normalize_path_cached(path)
 
     @staticmethod
     def should_prompt_for_ui_path_change(normalized_path: str, ui_path: str, compare_with_ui_path: bool = True) -> bool:
@@ -1308,7 +1528,7 @@ class MainWindow(QMainWindow):
         text = clipboard.text().strip()
         if text:
             # 自動偵測並填入對應輸入框
-            if "list=" in text or "playlist" in text.lower():
+            if PATTERNS.PLAYLIST_URL.search(text):
                 self.playlist_url_edit.setText(text)
                 self.playlist_radio.setChecked(True)
             else:
@@ -1347,7 +1567,7 @@ class MainWindow(QMainWindow):
         """處理拖入的 URL"""
         if not url:
             return
-        if "list=" in url or "playlist" in url.lower():
+        if PATTERNS.PLAYLIST_URL.search(url):
             self.playlist_url_edit.setText(url)
             self.playlist_radio.setChecked(True)
         else:
@@ -1401,9 +1621,10 @@ class MainWindow(QMainWindow):
         scroll_layout.addWidget(self.create_input_group())
         scroll_layout.addWidget(self.create_remembered_playlists_group())
         scroll_layout.addWidget(self.create_path_group())
-        scroll_layout.addWidget(self.create_download_settings_group())
-        scroll_layout.addWidget(self.create_cookie_group())
-        scroll_layout.addWidget(self.create_subtitle_group())
+        # 下載設定/Cookie/字幕群組延後到事件圈首輪再建立（_build_deferred_groups），
+        # 減少首次繪製前的 widget 建構量；記下插入位置以維持原本的排列順序
+        self._deferred_groups_layout = scroll_layout
+        self._deferred_groups_index = scroll_layout.count()
         scroll_layout.addWidget(self.create_action_buttons())
         scroll_layout.addStretch()
 
@@ -1450,6 +1671,11 @@ class MainWindow(QMainWindow):
         self.single_url_edit = QLineEdit()
         self.single_url_edit.setPlaceholderText("輸入影片網址...")
         self.single_url_edit.setToolTip("可輸入 YouTube 或 Bilibili 影片網址")
+        # 100ms 去抖動：連續打字時不必每個按鍵都重新判斷 URL 類型
+        self._single_url_debounce = QTimer(self)
+        self._single_url_debounce.setSingleShot(True)
+        self._single_url_debounce.setInterval(100)
+        self._single_url_debounce.timeout.connect(self._apply_single_url_detection)
         self.single_url_edit.textChanged.connect(self._on_single_url_changed)
         layout.addWidget(self.single_url_edit)
 
@@ -1530,13 +1756,20 @@ class MainWindow(QMainWindow):
         self.update_remembered_playlist_buttons()
         return group
 
-    def _on_single_url_changed(self, text: str):
-        """當單一影片 URL 變更時自動偵測類型"""
+    def _on_single_url_changed(self, _text: str):
+        """單一影片 URL 變更時重新啟動去抖動計時器"""
+        self._single_url_debounce.start()
+
+    def _apply_single_url_detection(self):
+        """去抖動後自動偵測 URL 類型"""
+        text = self.single_url_edit.text()
         if text.strip():
             self.single_radio.setChecked(True)
-            # 如果是播放清單 URL，自動切換
-            if "list=" in text:
+            # 如果是播放清單 URL，自動切換；setText 期間擋住 signal 避免連鎖觸發
+            if PATTERNS.PLAYLIST_URL.search(text):
+                self.playlist_url_edit.blockSignals(True)
                 self.playlist_url_edit.setText(text)
+                self.playlist_url_edit.blockSignals(False)
                 self.playlist_radio.setChecked(True)
                 self.single_url_edit.clear()
 
@@ -1673,7 +1906,7 @@ class MainWindow(QMainWindow):
         layout = QFormLayout()
 
         self.quality_combo = QComboBox()
-        self.quality_combo.addItems(CONSTANTS.QUALITY_OPTIONS)
+        self.quality_combo.addItems(QUALITY_OPTIONS)
         self.quality_combo.setCurrentText("best")
         self.quality_combo.setToolTip("選擇下載畫質\nbest: 最高畫質\nworst: 最低畫質\n其他: 指定解析度上限")
         layout.addRow("畫質:", self.quality_combo)
@@ -1682,7 +1915,7 @@ class MainWindow(QMainWindow):
         self.timeout_spin = QSpinBox()
         self.timeout_spin.setMinimum(0)
         self.timeout_spin.setMaximum(36000)
-        self.timeout_spin.setValue(CONSTANTS.DEFAULT_TIMEOUT)
+        self.timeout_spin.setValue(DEFAULT_TIMEOUT)
         self.timeout_spin.setSuffix(" 秒")
         self.timeout_spin.setSpecialValueText("不限時")
         self.timeout_spin.setToolTip("設定單一影片下載超時時間\n0 表示不限時\n建議長影片設定較長時間")
@@ -1735,55 +1968,10 @@ class MainWindow(QMainWindow):
         group.setToolTip("Cookie 用於下載會員限定影片\n需先在瀏覽器登入後提取")
         layout = QVBoxLayout()
 
-        # YouTube Cookie
-        youtube_layout = QHBoxLayout()
-        self.youtube_status_label = QLabel("🟡")
-        self.youtube_status_label.setToolTip("Cookie 狀態：未驗證")
-        self.youtube_status_label.setFixedWidth(20)
-        youtube_layout.addWidget(self.youtube_status_label)
-        youtube_layout.addWidget(QLabel("YouTube:"))
-
-        self.youtube_cookie_edit = QLineEdit()
-        self.youtube_cookie_edit.setPlaceholderText("YouTube Cookie 檔案...")
-        self.youtube_cookie_edit.setReadOnly(True)
-        self.youtube_cookie_edit.setToolTip("從 Firefox 瀏覽器提取的 Cookie 檔案")
-        youtube_layout.addWidget(self.youtube_cookie_edit)
-
-        youtube_extract_btn = QPushButton("提取")
-        youtube_extract_btn.clicked.connect(lambda: self.extract_cookies("youtube"))
-        youtube_extract_btn.setToolTip("從 Firefox 自動提取登入 Cookie\n需先登入 YouTube")
-        youtube_layout.addWidget(youtube_extract_btn)
-
-        youtube_test_btn = QPushButton("測試")
-        youtube_test_btn.clicked.connect(lambda: self.test_cookies("youtube"))
-        youtube_test_btn.setToolTip("驗證 Cookie 是否有效")
-        youtube_layout.addWidget(youtube_test_btn)
-        layout.addLayout(youtube_layout)
-
-        # Bilibili Cookie
-        bilibili_layout = QHBoxLayout()
-        self.bilibili_status_label = QLabel("🟡")
-        self.bilibili_status_label.setToolTip("Cookie 狀態：未驗證")
-        self.bilibili_status_label.setFixedWidth(20)
-        bilibili_layout.addWidget(self.bilibili_status_label)
-        bilibili_layout.addWidget(QLabel("Bilibili:"))
-
-        self.bilibili_cookie_edit = QLineEdit()
-        self.bilibili_cookie_edit.setPlaceholderText("Bilibili Cookie 檔案...")
-        self.bilibili_cookie_edit.setReadOnly(True)
-        self.bilibili_cookie_edit.setToolTip("從 Firefox 瀏覽器提取的 Cookie 檔案")
-        bilibili_layout.addWidget(self.bilibili_cookie_edit)
-
-        bilibili_extract_btn = QPushButton("提取")
-        bilibili_extract_btn.clicked.connect(lambda: self.extract_cookies("bilibili"))
-        bilibili_extract_btn.setToolTip("從 Firefox 自動提取登入 Cookie\n需先登入 Bilibili")
-        bilibili_layout.addWidget(bilibili_extract_btn)
-
-        bilibili_test_btn = QPushButton("測試")
-        bilibili_test_btn.clicked.connect(lambda: self.test_cookies("bilibili"))
-        bilibili_test_btn.setToolTip("驗證 Cookie 是否有效")
-        bilibili_layout.addWidget(bilibili_test_btn)
-        layout.addLayout(bilibili_layout)
+        # YouTube / Bilibili 兩列結構相同，資料驅動產生
+        self.cookie_status_labels: dict[str, QLabel] = {}
+        for key, label in (("youtube", "YouTube"), ("bilibili", "Bilibili")):
+            layout.addLayout(self._build_cookie_row(key, label))
 
         self.use_cookies_check = QCheckBox("啟用 Cookies (會員影片)")
         self.use_cookies_check.setChecked(True)
@@ -1793,13 +1981,38 @@ class MainWindow(QMainWindow):
         group.setLayout(layout)
         return group
 
+    def _build_cookie_row(self, key: str, label: str) -> QHBoxLayout:
+        """建立單一平台的 Cookie 狀態列（狀態燈 + 路徑 + 提取/測試按鈕）"""
+        row = QHBoxLayout()
+        status_label = QLabel("🟡")
+        status_label.setToolTip("Cookie 狀態：未驗證")
+        status_label.setFixedWidth(20)
+        row.addWidget(status_label)
+        row.addWidget(QLabel(f"{label}:"))
+
+        cookie_edit = QLineEdit()
+        cookie_edit.setPlaceholderText(f"{label} Cookie 檔案...")
+        cookie_edit.setReadOnly(True)
+        cookie_edit.setToolTip("從 Firefox 瀏覽器提取的 Cookie 檔案")
+        row.addWidget(cookie_edit)
+
+        extract_btn = QPushButton("提取")
+        extract_btn.clicked.connect(lambda: self.extract_cookies(key))
+        extract_btn.setToolTip(f"從 Firefox 自動提取登入 Cookie\n需先登入 {label}")
+        row.addWidget(extract_btn)
+
+        test_btn = QPushButton("測試")
+        test_btn.clicked.connect(lambda: self.test_cookies(key))
+        test_btn.setToolTip("驗證 Cookie 是否有效")
+        row.addWidget(test_btn)
+
+        self.cookie_status_labels[key] = status_label
+        setattr(self, f"{key}_cookie_edit", cookie_edit)
+        return row
+
     def update_cookie_status(self, platform: str, is_valid: bool | None):
         """更新 Cookie 狀態指示器"""
-        if platform == "youtube":
-            label = self.youtube_status_label
-        else:
-            label = self.bilibili_status_label
-
+        label = self.cookie_status_labels[platform]
         if is_valid is None:
             label.setText("🟡")
             label.setToolTip("Cookie 狀態：未驗證")
@@ -1895,45 +2108,22 @@ class MainWindow(QMainWindow):
         self.overview_log = QTextEdit()
         self.overview_log.setReadOnly(True)
         self.overview_log.setFont(QFont("Consolas", 9))
+        # 限制文件行數，避免長時間執行後 relayout 成本隨日誌無限成長
+        self.overview_log.document().setMaximumBlockCount(2000)
 
-        welcome_msg = f""" 影片批量下載工具 {APP_VERSION} - PySide6 版本
-
- 支援平台: YouTube & Bilibili
- Cookie 提取: Firefox 瀏覽器登入後提取
- 核心改進:
-    預編譯正規表達式提升效能
-    自動重試機制
-    增強的錯誤處理
+        # 日誌先進緩衝，GUI 執行緒的計時器每 50ms 批次 append 一次
+        self._overview_log_buffer: deque[str] = deque()
+        self._overview_flush_timer = QTimer(self)
+        self._overview_flush_timer.setInterval(50)
+        self._overview_flush_timer.timeout.connect(self._flush_overview_log)
+        self._overview_flush_timer.start()
 
-等待您的操作...
-"""
-        self.overview_log.setPlainText(welcome_msg)
+        self.overview_log.setPlainText(WELCOME_MSG)
         layout.addWidget(self.overview_log)
         return widget
 
     def apply_stylesheet(self):
-        style = """
-        QMainWindow { background-color: #1e1e1e; color: #d4d4d4; }
-        QGroupBox { font-weight: bold; border: 1px solid #3c3c3c; border-radius: 4px; margin-top: 8px; padding-top: 8px; }
-        QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }
-        QPushButton { background-color: #0e639c; color: white; border: none; border-radius: 4px; padding: 6px 12px; font-weight: bold; }
-        QPushButton:hover { background-color: #1177bb; }
-        QPushButton:pressed { background-color: #0d5689; }
-        QPushButton:disabled { background-color: #3c3c3c; color: #6e6e6e; }
-        QLineEdit, QComboBox, QTextEdit { background-color: #3c3c3c; color: #d4d4d4; border: 1px solid #6e6e6e; border-radius: 2px; padding: 4px; }
-        QLineEdit:focus, QComboBox:focus { border: 1px solid #0e639c; }
-        QTextEdit { font-family: "Consolas", "Monaco", monospace; }
-        QProgressBar { border: 1px solid #3c3c3c; border-radius: 4px; text-align: center; background-color: #2d2d30; }
-        QProgressBar::chunk { background-color: #0e639c; border-radius: 3px; }
-        QTabWidget::pane { border: 1px solid #3c3c3c; background-color: #252526; }
-        QTabBar::tab { background-color: #2d2d30; color: #d4d4d4; padding: 8px 16px; border: 1px solid #3c3c3c; }
-        QTabBar::tab:selected { background-color: #1e1e1e; border-bottom: 2px solid #0e639c; }
-        QCheckBox, QRadioButton { color: #d4d4d4; }
-        QLabel { color: #d4d4d4; }
-        QToolBar { background-color: #2d2d30; border-bottom: 1px solid #3c3c3c; spacing: 5px; }
-        QStatusBar { background-color: #007acc; color: white; }
-        """
-        self.setStyleSheet(style)
+        self.setStyleSheet(STYLESHEET)
 
     def browse_url_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "選擇網址清單檔案", "", "文字檔案 (*.txt);;所有檔案 (*.*)")
@@ -1953,10 +2143,16 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "警告", "請先選擇有效的下載路徑。")
 
+    def _set_cookie_path(self, platform: str, output_file: str) -> str:
+        """記錄提取出的 cookie 檔完整路徑並更新對應欄位"""
+        full_path = os.path.join(self._cwd, output_file)
+        setattr(self, f"{platform}_cookie_file", full_path)
+        getattr(self, f"{platform}_cookie_edit").setText(full_path)
+        return full_path
+
     def extract_cookies(self, platform: str):
         self.log_to_overview(f" 開始提取 {platform.upper()} Cookies...")
-        timestamp = int(time.time())
-        output_file = f"{platform}_cookies_{timestamp}.txt"
+        output_file = f"{platform}_cookies_{next(self._extract_counter)}.txt"
 
         if platform == "youtube":
             fn = self.cookie_manager.extract_firefox_cookies_youtube
@@ -1971,8 +2167,7 @@ class MainWindow(QMainWindow):
             success, message = result
             if platform == "youtube":
                 if success:
-                    self.youtube_cookie_file = os.path.abspath(output_file)
-                    self.youtube_cookie_edit.setText(self.youtube_cookie_file)
+                    self._set_cookie_path(platform, output_file)
                     self.log_to_overview(" YouTube Cookies 提取成功")
                     QMessageBox.information(self, "成功", f"YouTube Cookies 提取成功！\n\n{message}")
                 else:
@@ -1980,8 +2175,7 @@ class MainWindow(QMainWindow):
                     QMessageBox.warning(self, "失敗", f"Cookie 提取失敗\n\n{message}")
             elif platform == "bilibili":
                 if success:
-                    self.bilibili_cookie_file = os.path.abspath(output_file)
-                    self.bilibili_cookie_edit.setText(self.bilibili_cookie_file)
+                    self._set_cookie_path(platform, output_file)
                     self.log_to_overview(" Bilibili Cookies 提取完成")
                     QMessageBox.information(self, "提取完成", f"Bilibili Cookies 已提取\n\n{message}")
                 else:
@@ -2048,6 +2242,10 @@ class MainWindow(QMainWindow):
         if not download_path:
             QMessageBox.warning(self, "警告", "請選擇下載路徑")
             return
+        # 便宜的檢查先做：路徑無效就不必讀清單檔、更不必為取 metadata 生 yt-dlp 子程序
+        if not self._probe_path(self.normalize_path(download_path), os.path.isdir):
+            QMessageBox.warning(self, "警告", f"下載路徑不存在:\n{download_path}")
+            return
 
         urls = self.get_urls()
         if not urls:
@@ -2213,7 +2411,7 @@ class MainWindow(QMainWindow):
 
     def build_download_settings(self, download_path: str) -> dict | None:
         normalized_path = self.normalize_path(download_path)
-        if not os.path.isdir(normalized_path):
+        if not self._probe_path(normalized_path, os.path.isdir):
             QMessageBox.warning(self, "警告", f"下載路徑不存在:\n{download_path}")
             return None
         selected_platform_id = self.platform_buttons.checkedId()
@@ -2249,18 +2447,23 @@ class MainWindow(QMainWindow):
             if not os.path.exists(file_path):
                 return []
             try:
-                with open(file_path, encoding="utf-8") as f:
-                    return [line.strip() for line in f if line.strip()]
+                # 64KB 緩衝減少大型清單檔的 read syscall 次數
+                with open(file_path, encoding="utf-8", buffering=1 << 16) as f:
+                    return [stripped for line in f if (stripped := line.strip())]
             except (OSError, UnicodeDecodeError):
                 return []
         return []
 
     def detect_platforms_from_urls(self, urls: list[str]) -> set:
         platforms = set()
+        targets = {"youtube", "bilibili"}
         for url in urls:
             platform = PlatformUtils.detect_platform(url)
             if platform != "unknown":
                 platforms.add(platform)
+                # 兩個平台都出現後就不必再掃剩下的 URL
+                if platforms >= targets:
+                    break
         return platforms
 
     def auto_extract_cookies_if_needed(self, urls: list[str]):
@@ -2272,13 +2475,13 @@ class MainWindow(QMainWindow):
         platforms = self.detect_platforms_from_urls(urls)
         tasks = []
 
-        if "youtube" in platforms and (not self.youtube_cookie_file or not os.path.exists(self.youtube_cookie_file)):
-            timestamp = int(time.time())
-            tasks.append(("youtube", f"youtube_cookies_{timestamp}.txt"))
+        if "youtube" in platforms and (not self.youtube_cookie_file or not self._probe_path(self.youtube_cookie_file)):
+            tasks.append(("youtube", f"youtube_cookies_{next(self._extract_counter)}.txt"))
 
-        if "bilibili" in platforms and (not self.bilibili_cookie_file or not os.path.exists(self.bilibili_cookie_file)):
-            timestamp = int(time.time())
-            tasks.append(("bilibili", f"bilibili_cookies_{timestamp}.txt"))
+        if "bilibili" in platforms and (
+            not self.bilibili_cookie_file or not self._probe_path(self.bilibili_cookie_file)
+        ):
+            tasks.append(("bilibili", f"bilibili_cookies_{next(self._extract_counter)}.txt"))
 
         if not tasks:
             if on_complete:
@@ -2291,14 +2494,11 @@ class MainWindow(QMainWindow):
             def handler(result):
                 success, _ = result
                 if success:
-                    if platform == "youtube":
-                        self.youtube_cookie_file = os.path.abspath(output_file)
-                        self.youtube_cookie_edit.setText(self.youtube_cookie_file)
-                        self.log_to_overview(" YouTube Cookie 自動提取成功")
-                    elif platform == "bilibili":
-                        self.bilibili_cookie_file = os.path.abspath(output_file)
-                        self.bilibili_cookie_edit.setText(self.bilibili_cookie_file)
-                        self.log_to_overview(" Bilibili Cookie 自動提取成功")
+                    # 提取寫出了新檔案，讓探測快取失效
+                    self._path_probe_cache.clear()
+                    self._set_cookie_path(platform, output_file)
+                    label = "YouTube" if platform == "youtube" else "Bilibili"
+                    self.log_to_overview(f" {label} Cookie 自動提取成功")
                 remaining[0] -= 1
                 if remaining[0] <= 0 and on_complete:
                     on_complete()
@@ -2317,7 +2517,22 @@ class MainWindow(QMainWindow):
             self._keep_worker_alive(worker)
             worker.start()
 
-    def fetch_playlist_metadata(self, playlist_url: str) -> dict | None:
+    def fetch_playlist_metadata(self, playlist_url: str, refresh: bool = False) -> dict | None:
+        """取得播放清單 metadata，TTL 內命中快取就不跑 yt-dlp；refresh=True 強制重抓。"""
+        now = time.time()
+        if not refresh:
+            with self._metadata_cache_lock:
+                entry = self._metadata_cache.get(playlist_url)
+            if entry and now - entry[0] < METADATA_CACHE_TTL:
+                return entry[1]
+        metadata = self._fetch_playlist_metadata_uncached(playlist_url)
+        if metadata is not None:
+            with self._metadata_cache_lock:
+                self._metadata_cache[playlist_url] = [now, metadata]
+            self.save_metadata_cache()
+        return metadata
+
+    def _fetch_playlist_metadata_uncached(self, playlist_url: str) -> dict | None:
         try:
             cmd = bin_manager.get_base_ytdlp_cmd() + ["-J", "--flat-playlist"]
             # 使用 cookie 檔案或直接從瀏覽器讀取
@@ -2335,9 +2550,6 @@ class MainWindow(QMainWindow):
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 timeout=180,
                 env=bin_manager.get_ytdlp_env(),
             )
@@ -2347,15 +2559,17 @@ class MainWindow(QMainWindow):
                 result = subprocess.run(
                     cmd_no_cookie,
                     capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
                     timeout=180,
                     env=bin_manager.get_ytdlp_env(),
                 )
             if result.returncode != 0:
                 return None
-            return json.loads(result.stdout)
+            # json.loads 可直接解析 UTF-8 bytes，省掉整份輸出的 str 複本
+            try:
+                return json.loads(result.stdout)
+            except UnicodeDecodeError:
+                # 輸出含無效位元組時才退回 replace 解碼
+                return json.loads(result.stdout.decode("utf-8", "replace"))
         except (OSError, subprocess.SubprocessError, json.JSONDecodeError):
             return None
 
@@ -2383,7 +2597,8 @@ class MainWindow(QMainWindow):
         self.log_to_overview(" 取得播放清單資訊中...")
         self.statusBar().showMessage("取得播放清單資訊中...")
 
-        worker = AsyncWorker(self.fetch_playlist_metadata, playlist_url)
+        # 手動檢查視同要求最新狀態，略過 metadata 快取
+        worker = AsyncWorker(self.fetch_playlist_metadata, playlist_url, refresh=manual_trigger)
 
         def on_done(metadata):
             self.statusBar().clearMessage()
@@ -2462,8 +2677,7 @@ class MainWindow(QMainWindow):
         if not entries:
             return {**base_result, "status": "error", "reason": "empty"}
 
-        unavailable_titles = {"[deleted video]", "[private video]"}
-        available_entries = [e for e in entries if (e.get("title") or "").strip().lower() not in unavailable_titles]
+        available_entries = [e for e in entries if (e.get("title") or "").strip().lower() not in UNAVAILABLE_TITLES]
 
         playlist_id = metadata.get("id") or PlatformUtils.extract_playlist_id(playlist_url)
         base_result["playlist_id"] = playlist_id
@@ -2471,13 +2685,16 @@ class MainWindow(QMainWindow):
 
         prev_state = self.playlist_states.get(normalized_path, {}).get(playlist_id, {})
         prev_ids = set(prev_state.get("video_ids", []))
+        current_set = set(current_ids)
 
-        added_videos = [{"id": vid, "title": ""} for vid in current_ids if vid not in prev_ids]
-        removed_ids = [vid for vid in prev_ids if vid not in current_ids]
-
+        removed_ids = [vid for vid in prev_ids if vid not in current_set]
+        # 一趟走完 current_ids 同時算出新增與本地缺檔，維持清單原始順序
+        added_videos = []
         missing_videos = []
         for vid in current_ids:
-            if vid in prev_ids and not self._has_local_file_for_video(normalized_path, vid):
+            if vid not in prev_ids:
+                added_videos.append({"id": vid, "title": ""})
+            elif not self._has_local_file_for_video(normalized_path, vid):
                 missing_videos.append({"id": vid, "title": ""})
 
         has_changes = bool(added_videos or removed_ids or missing_videos)
@@ -2516,6 +2733,7 @@ class MainWindow(QMainWindow):
             )
 
         if missing_videos:
+            # 鎖內只做 dict 清理；快照/排程寫檔留到鎖外，別讓下載執行緒等在這裡
             with self._history_lock:
                 for vid_info in missing_videos:
                     vid = vid_info["id"]
@@ -2523,7 +2741,7 @@ class MainWindow(QMainWindow):
                         del self.download_history[normalized_path][vid]
                 if normalized_path in self.download_history and not self.download_history[normalized_path]:
                     del self.download_history[normalized_path]
-                self.save_download_history()
+            self.save_download_history()
 
         all_actionable = added_videos + missing_videos
         if offer_auto_download and all_actionable:
@@ -2554,11 +2772,10 @@ class MainWindow(QMainWindow):
             if not metadata:
                 return None
             entries = metadata.get("entries") or []
-            unavailable_titles = {"[deleted video]", "[private video]"}
             video_ids = [
                 e.get("id") or e.get("url")
                 for e in entries
-                if (e.get("id") or e.get("url")) and (e.get("title") or "").strip().lower() not in unavailable_titles
+                if (e.get("id") or e.get("url")) and (e.get("title") or "").strip().lower() not in UNAVAILABLE_TITLES
             ]
             return video_ids
 
@@ -2590,11 +2807,10 @@ class MainWindow(QMainWindow):
             if not metadata:
                 return [], 0
             entries = metadata.get("entries") or []
-            unavailable_titles = {"[deleted video]", "[private video]"}
             video_ids = [
                 e.get("id") or e.get("url")
                 for e in entries
-                if (e.get("id") or e.get("url")) and (e.get("title") or "").strip().lower() not in unavailable_titles
+                if (e.get("id") or e.get("url")) and (e.get("title") or "").strip().lower() not in UNAVAILABLE_TITLES
             ]
 
         return self._expand_playlist_urls_from_ids(playlist_url, video_ids, download_path)
@@ -2714,7 +2930,14 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(f"批次檢查 {len(playlist_jobs)} 個播放清單中...")
         self.set_batch_check_running(True, len(playlist_jobs))
 
-        worker = PlaylistBatchCheckWorker(playlist_jobs, self.fetch_playlist_metadata)
+        # 手動批次檢查略過 metadata 快取，確保拿到最新清單
+        if manual_trigger:
+
+            def fetch(url):
+                return self.fetch_playlist_metadata(url, refresh=True)
+        else:
+            fetch = self.fetch_playlist_metadata
+        worker = PlaylistBatchCheckWorker(playlist_jobs, fetch)
         self.batch_check_worker = worker
 
         def on_done(results, cancelled):
@@ -2883,8 +3106,18 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "任務完成但有失敗", summary)
 
     def log_to_overview(self, message: str):
+        # 只排入緩衝；worker 執行緒也會呼叫，實際 append 統一由 GUI 計時器處理
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.overview_log.append(f"[{timestamp}] {message}")
+        self._overview_log_buffer.append(f"[{timestamp}] {message}")
+
+    def _flush_overview_log(self):
+        """合併緩衝的日誌為單次 append，一個 flush 週期只 relayout 一次"""
+        if not self._overview_log_buffer:
+            return
+        lines = []
+        while self._overview_log_buffer:
+            lines.append(self._overview_log_buffer.popleft())
+        self.overview_log.append("\n".join(lines))
 
     def check_dependencies(self):
         self.log_to_overview(" 檢查 yt-dlp / ffmpeg...")
@@ -3018,6 +3251,16 @@ A: 確認 URL 正確無誤，嘗試重新下載。
         except (OSError, json.JSONDecodeError):
             self.playlist_updates_log = []
 
+    def load_metadata_cache(self):
+        try:
+            if os.path.exists(self.metadata_cache_file):
+                with open(self.metadata_cache_file, encoding="utf-8") as f:
+                    cache = json.load(f)
+                with self._metadata_cache_lock:
+                    self._metadata_cache = prune_metadata_cache(cache, time.time())
+        except (OSError, json.JSONDecodeError):
+            self._metadata_cache = {}
+
     def _normalize_download_history_keys(self):
         normalized = {}
         for path, videos in (self.download_history or {}).items():
@@ -3037,16 +3280,22 @@ A: 確認 URL 正確無誤，嘗試重新下載。
         self.playlist_states = normalized
 
     def save_download_history(self):
-        try:
-            atomic_write_json(self.download_history_file, self.download_history)
-        except OSError:
-            pass
+        # 鎖內只做兩層淺複製（最內層 entry 只會整顆替換、不會就地修改），
+        # JSON 序列化與檔案 I/O 都交給背景執行緒在 flush 週期內合併處理
+        with self._history_lock:
+            snapshot = {path: dict(videos) for path, videos in self.download_history.items()}
+        self._persist_worker.submit(self.download_history_file, snapshot)
 
     def save_playlist_states(self):
-        try:
-            atomic_write_json(self.playlist_state_file, self.playlist_states)
-        except OSError:
-            pass
+        # 序列化已延後到背景執行緒，先淺複製兩層避免 dumps 時主執行緒同時改動
+        snapshot = {path: dict(playlists) for path, playlists in self.playlist_states.items()}
+        self._persist_worker.submit(self.playlist_state_file, snapshot)
+
+    def save_metadata_cache(self):
+        # 批次檢查的 pool 執行緒會同時寫入快取，鎖內淺複製後再交給背景執行緒序列化
+        with self._metadata_cache_lock:
+            snapshot = dict(self._metadata_cache)
+        self._persist_worker.submit(self.metadata_cache_file, snapshot)
 
     def update_playlist_state(
         self,
@@ -3082,44 +3331,95 @@ A: 確認 URL 正確無誤，嘗試重新下載。
                 "title": title,
                 "timestamp": datetime.datetime.now().isoformat(),
             }
-            self.save_download_history()
+        self.save_download_history()
 
-    def is_downloaded(self, download_path: str, video_id: str) -> bool:
+    def is_downloaded(self, download_path: str, video_id: str, local_file_names: list[str] | None = None) -> bool:
         download_path = self.normalize_path(download_path)
-        if self._has_local_file_for_video(download_path, video_id):
+        with self._history_lock:
+            in_history = download_path in self.download_history and video_id in self.download_history[download_path]
+        if not in_history and local_file_names is None:
+            # 不在歷史中的新影片只查 bracket id 索引；整份新清單不必每部影片
+            # 都對資料夾逐名比對，也沒有歷史紀錄需要對帳
+            _, indexed_ids = self._dir_index(download_path)
+            return video_id.strip() in indexed_ids
+        if self._has_local_file_for_video(download_path, video_id, local_file_names):
             return True
+        stale = False
         with self._history_lock:
             if download_path in self.download_history and video_id in self.download_history[download_path]:
                 # 歷史紀錄存在但本地檔案已被刪除，移除紀錄以允許重新下載
                 del self.download_history[download_path][video_id]
                 if not self.download_history[download_path]:
                     del self.download_history[download_path]
-                self.save_download_history()
-                return False
-            return False
+                stale = True
+        if stale:
+            self.save_download_history()
+        return False
 
-    def _has_local_file_for_video(self, download_path: str, video_id: str) -> bool:
+    def list_local_video_files(self, download_path: str) -> list[str]:
+        """掃描一次下載資料夾，回傳影片檔名列表（批次下載時共用，避免每個 URL 重掃目錄）。"""
         download_path = self.normalize_path(download_path)
         if not download_path or not os.path.isdir(download_path):
-            return False
-        video_id_clean = video_id.strip()
+            return []
+        names = []
         try:
-            for name in os.listdir(download_path):
-                if not any(name.lower().endswith(ext) for ext in CONSTANTS.VIDEO_EXTENSIONS):
-                    continue
-                if name.endswith(CONSTANTS.IGNORE_SUFFIXES):
-                    continue
-                if f"[{video_id_clean}]" in name or video_id_clean in name:
+            with os.scandir(download_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(IGNORE_SUFFIXES):
+                        continue
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        names.append(name)
+        except OSError:
+            pass
+        return names
+
+    def _dir_index(self, download_path: str) -> tuple[list[str], set[str]]:
+        """取得資料夾的影片檔名與 bracket id 索引，以目錄 mtime 判斷快取是否失效。
+
+        批次檢查清單時每個影片 id 都要比對本地檔案；同一個資料夾只掃一次、
+        之後都是 O(1) 的集合查詢，檔案增減會改變目錄 mtime 而自動重建。
+        """
+        try:
+            mtime = os.stat(download_path).st_mtime
+        except OSError:
+            return [], set()
+        cached = self._dir_index_cache.get(download_path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        names = self.list_local_video_files(download_path)
+        bracket_search = PATTERNS.BRACKET_ID.search
+        ids = {match.group(1) for name in names if (match := bracket_search(name))}
+        self._dir_index_cache[download_path] = (mtime, names, ids)
+        return names, ids
+
+    def _has_local_file_for_video(
+        self, download_path: str, video_id: str, file_names: list[str] | None = None, fuzzy: bool = False
+    ) -> bool:
+        video_id_clean = video_id.strip()
+        if file_names is None:
+            file_names, indexed_ids = self._dir_index(download_path)
+            if video_id_clean in indexed_ids:
+                return True
+        # 綁定一次 search 方法，迴圈內每個檔名省掉兩層屬性查找
+        bracket_search = PATTERNS.BRACKET_ID.search
+        bracket_token = f"[{video_id_clean}]"
+        for name in file_names:
+            if bracket_token in name or video_id_clean in name:
+                return True
+            bracket_match = bracket_search(name)
+            if bracket_match:
+                file_id = bracket_match.group(1)
+                if file_id in video_id_clean or video_id_clean in file_id:
                     return True
-                bracket_match = PATTERNS.BRACKET_ID.search(name)
-                if bracket_match:
-                    file_id = bracket_match.group(1)
-                    if file_id in video_id_clean or video_id_clean in file_id:
-                        return True
+                # SequenceMatcher 是 O(n·m) 純 Python，批次檢查時會吃掉大半 CPU；
+                # 預設關閉，正規命名的檔案靠上面的精確比對就足夠
+                if fuzzy:
+                    # difflib 只有模糊比對會用到，延後 import 以縮短啟動時間
+                    from difflib import SequenceMatcher
+
                     if SequenceMatcher(None, file_id, video_id_clean).ratio() >= 0.75:
                         return True
-        except OSError:
-            pass
         return False
 
     def load_settings(self):
@@ -3129,7 +3429,7 @@ A: 確認 URL 正確無誤，嘗試重新下載。
         idx = self.quality_combo.findText(quality)
         if idx >= 0:
             self.quality_combo.setCurrentIndex(idx)
-        self.timeout_spin.setValue(int(self.settings.value("download_timeout", CONSTANTS.DEFAULT_TIMEOUT)))
+        self.timeout_spin.setValue(int(self.settings.value("download_timeout", DEFAULT_TIMEOUT)))
         self.custom_filename_check.setChecked(
             str(self.settings.value("use_custom_filename", "false")).lower() == "true"
         )
@@ -3163,10 +3463,13 @@ A: 確認 URL 正確無誤，嘗試重新下載。
         self.save_settings()
         self.save_download_history()
         self.save_playlist_states()
+        self._persist_worker.commit()
         self.cleanup_cookies()
         event.accept()
 
     def cleanup_cookies(self):
+        import glob
+
         try:
             for pattern in ["youtube_cookies_*.txt", "bilibili_cookies_*.txt"]:
                 for cookie_file in glob.glob(pattern):